@@ -10,6 +10,7 @@ import signal
 sys.path.insert(0, os.path.dirname(__file__))
 
 from src.bot.bot import LeadScraperBot
+from src.database.db import migrate_dedup_index
 from src.scheduler.task_scheduler import task_scheduler
 from src.utils.config import config
 
@@ -48,6 +49,13 @@ class Application:
         # Print config
         config.print_config()
 
+        # Company upserts need a unique dedup index; upgrade older databases
+        try:
+            migrate_dedup_index()
+        except Exception as e:
+            logger.error(f"❌ Database migration failed: {e}")
+            sys.exit(1)
+
         try:
             # Initialize bot
             logger.info("🤖 Initializing Telegram bot...")
@@ -131,6 +139,13 @@ async def main():
 
 
 if __name__ == '__main__':
+    # Faster libuv-based event loop when available (not on Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
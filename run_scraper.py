@@ -8,6 +8,7 @@ import logging
 
 sys.path.insert(0, os.path.dirname(__file__))
 
+from src.database.db import migrate_dedup_index
 from src.parsers.parser_manager import parser_manager
 from src.parsers.twogis_parser import TwoGISParser
 from src.utils.config import config
@@ -71,6 +72,14 @@ class MockParser:
         """Mock close"""
         pass
 
+    async def __aenter__(self):
+        """Mock async context enter"""
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        """Mock async context exit"""
+        await self.close()
+
 
 async def run_scraping(use_mock: bool = False):
     """
@@ -83,6 +92,9 @@ async def run_scraping(use_mock: bool = False):
     logger.info("Starting Lead Scraper")
     logger.info("="*60)
 
+    # Company upserts need a unique dedup index; upgrade older databases
+    migrate_dedup_index()
+
     # Register parsers
     if use_mock:
         logger.info("Using MOCK parser for testing")
@@ -129,4 +141,11 @@ async def main():
 
 
 if __name__ == '__main__':
+    # Faster libuv-based event loop when available (not on Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     asyncio.run(main())
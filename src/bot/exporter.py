@@ -6,6 +6,7 @@ import csv
 from datetime import datetime
 from typing import List, Optional
 import pandas as pd
+from sqlalchemy import func
 
 from ..database.models import Company, Category, ExportLog
 from ..database.db import get_db_session
@@ -15,6 +16,63 @@ from ..utils.config import config
 class CSVExporter:
     """Export leads to CSV files"""
 
+    # CSV columns, in order
+    CSV_HEADER = (
+        'Название', 'Категория', 'Адрес', 'Город', 'Район', 'Телефон', 'Email',
+        'Сайт', 'Instagram', 'Facebook', 'VK', 'Telegram', 'Рейтинг', 'Отзывов',
+        'Широта', 'Долгота', 'Источник', 'Дата обновления'
+    )
+
+    @staticmethod
+    def _filter_leads(query, category_ids: Optional[List[int]], include_inactive: bool):
+        """
+        Apply export filters to a query joined with Category
+
+        Args:
+            query: Query over Company joined with Category
+            category_ids: Optional list of category IDs to filter
+            include_inactive: Whether to include inactive companies
+
+        Returns:
+            Filtered query
+        """
+        if category_ids:
+            query = query.filter(Company.category_id.in_(category_ids))
+
+        if not include_inactive:
+            query = query.filter(Company.is_active == True)
+
+        return query
+
+    @staticmethod
+    def _category_stats(session, category_ids: Optional[List[int]], include_inactive: bool) -> dict:
+        """
+        Count exported leads per category with a single GROUP BY
+
+        Args:
+            session: Database session
+            category_ids: Optional list of category IDs to filter
+            include_inactive: Whether to include inactive companies
+
+        Returns:
+            dict: {'total': int, 'by_category': {name_ru: count}}
+        """
+        query = session.query(
+            Category.name_ru,
+            func.count(Company.id)
+        ).select_from(Company).join(Category)
+
+        by_category = dict(
+            CSVExporter._filter_leads(query, category_ids, include_inactive)
+            .group_by(Category.name_ru)
+            .all()
+        )
+
+        return {
+            'total': sum(by_category.values()),
+            'by_category': by_category
+        }
+
     @staticmethod
     def export_leads(
         category_ids: Optional[List[int]] = None,
@@ -23,6 +81,9 @@ class CSVExporter:
         """
         Export leads to CSV file
 
+        Stats are aggregated in the database and rows are streamed from a
+        column query straight into the CSV writer.
+
         Args:
             category_ids: Optional list of category IDs to filter
             include_inactive: Whether to include inactive companies
@@ -31,47 +92,23 @@ class CSVExporter:
             tuple: (file_path, stats_dict)
         """
         with get_db_session() as session:
-            # Build query
-            query = session.query(Company).join(Category)
-
-            if category_ids:
-                query = query.filter(Company.category_id.in_(category_ids))
-
-            if not include_inactive:
-                query = query.filter(Company.is_active == True)
+            stats = CSVExporter._category_stats(session, category_ids, include_inactive)
 
-            # Order by category and name
-            companies = query.order_by(Category.name, Company.name).all()
-
-            if not companies:
+            if not stats['total']:
                 return None, {'total': 0, 'by_category': {}}
 
-            # Prepare data
-            data = []
-            for company in companies:
-                data.append({
-                    'Название': company.name or '',
-                    'Категория': company.category.name_ru if company.category else '',
-                    'Адрес': company.address or '',
-                    'Город': company.city or '',
-                    'Район': company.district or '',
-                    'Телефон': company.phone or '',
-                    'Email': company.email or '',
-                    'Сайт': company.website or '',
-                    'Instagram': company.instagram or '',
-                    'Facebook': company.facebook or '',
-                    'VK': company.vk or '',
-                    'Telegram': company.telegram or '',
-                    'Рейтинг': company.rating if company.rating else '',
-                    'Отзывов': company.reviews_count or 0,
-                    'Широта': company.latitude if company.latitude else '',
-                    'Долгота': company.longitude if company.longitude else '',
-                    'Источник': company.source or '',
-                    'Дата обновления': company.updated_at.strftime('%Y-%m-%d') if company.updated_at else ''
-                })
+            # Build query (only the exported columns, ordered by category and name)
+            query = session.query(
+                Company.name, Category.name_ru, Company.address, Company.city,
+                Company.district, Company.phone, Company.email, Company.website,
+                Company.instagram, Company.facebook, Company.vk, Company.telegram,
+                Company.rating, Company.reviews_count, Company.latitude,
+                Company.longitude, Company.source, Company.updated_at
+            ).join(Category)
 
-            # Create pandas DataFrame
-            df = pd.DataFrame(data)
+            rows = CSVExporter._filter_leads(
+                query, category_ids, include_inactive
+            ).order_by(Category.name, Company.name).yield_per(1000)
 
             # Generate filename
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -84,22 +121,33 @@ class CSVExporter:
             file_path = os.path.join(output_dir, filename)
 
             # Export to CSV
-            df.to_csv(
-                file_path,
-                index=False,
-                encoding=config.CSV_ENCODING,
-                quoting=csv.QUOTE_ALL
-            )
-
-            # Calculate stats
-            stats = {
-                'total': len(companies),
-                'by_category': {}
-            }
-
-            for company in companies:
-                cat_name = company.category.name_ru if company.category else 'Без категории'
-                stats['by_category'][cat_name] = stats['by_category'].get(cat_name, 0) + 1
+            with open(file_path, 'w', encoding=config.CSV_ENCODING, newline='') as f:
+                writer = csv.writer(f, quoting=csv.QUOTE_ALL, lineterminator=os.linesep)
+                writer.writerow(CSVExporter.CSV_HEADER)
+
+                for (name, category, address, city, district, phone, email, website,
+                     instagram, facebook, vk, telegram, rating, reviews_count,
+                     latitude, longitude, source, updated_at) in rows:
+                    writer.writerow((
+                        name or '',
+                        category or '',
+                        address or '',
+                        city or '',
+                        district or '',
+                        phone or '',
+                        email or '',
+                        website or '',
+                        instagram or '',
+                        facebook or '',
+                        vk or '',
+                        telegram or '',
+                        rating if rating else '',
+                        reviews_count or 0,
+                        latitude if latitude else '',
+                        longitude if longitude else '',
+                        source or '',
+                        updated_at.strftime('%Y-%m-%d') if updated_at else ''
+                    ))
 
             # Log export
             file_size = os.path.getsize(file_path)
@@ -107,7 +155,7 @@ class CSVExporter:
                 file_name=filename,
                 file_path=file_path,
                 file_size=file_size,
-                records_count=len(companies),
+                records_count=stats['total'],
                 categories_included=category_ids or []
             )
             session.add(export_log)
@@ -156,14 +204,10 @@ class CSVExporter:
             tuple: (file_path, stats_dict)
         """
         with get_db_session() as session:
-            # Build query (same as CSV export)
-            query = session.query(Company).join(Category)
-
-            if category_ids:
-                query = query.filter(Company.category_id.in_(category_ids))
-
-            if not include_inactive:
-                query = query.filter(Company.is_active == True)
+            # Build query (same filters as CSV export)
+            query = CSVExporter._filter_leads(
+                session.query(Company).join(Category), category_ids, include_inactive
+            )
 
             # Order by category and name
             companies = query.order_by(Category.name, Company.name).all()
@@ -230,14 +274,7 @@ class CSVExporter:
                     worksheet.column_dimensions[column_letter].width = adjusted_width
 
             # Calculate stats
-            stats = {
-                'total': len(companies),
-                'by_category': {}
-            }
-
-            for company in companies:
-                cat_name = company.category.name_ru if company.category else 'Без категории'
-                stats['by_category'][cat_name] = stats['by_category'].get(cat_name, 0) + 1
+            stats = CSVExporter._category_stats(session, category_ids, include_inactive)
 
             # Log export
             file_size = os.path.getsize(file_path)
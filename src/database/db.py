@@ -2,13 +2,14 @@
 Database connection and utilities
 """
 import os
+import hashlib
 from contextlib import contextmanager
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker, scoped_session
 from sqlalchemy.pool import QueuePool
 from dotenv import load_dotenv
 
-from .models import Base, Category
+from .models import Base, Category, dedup_key, hash_dedup_key
 
 # Load environment variables
 load_dotenv()
@@ -59,10 +60,106 @@ def init_database():
     Base.metadata.create_all(engine)
     print("✅ Database tables created")
 
+    # Upgrade indexes on databases created by older versions
+    migrate_dedup_index()
+
     # Seed categories
     seed_categories()
 
 
+def migrate_dedup_index():
+    """
+    Make the company dedup_hash index unique
+
+    create_all() does not alter existing indexes, so databases created
+    before the index was declared unique are upgraded here. Those
+    databases also hold MD5 dedup hashes, which are rewritten to BLAKE2b
+    first (see rehash_legacy_dedup). Company saves upsert with
+    ON CONFLICT (dedup_hash), which needs this index, so the application
+    runs this at startup as well as in init_database().
+
+    Raises:
+        RuntimeError: If duplicate hashes already exist; the old index is
+            left in place
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table('companies'):
+        return
+
+    for index in inspector.get_indexes('companies'):
+        if index['name'] == 'idx_company_dedup' and not index['unique']:
+            with engine.begin() as conn:
+                rehashed = rehash_legacy_dedup(conn)
+                if rehashed:
+                    print(f"✅ Rehashed {rehashed} legacy company dedup hashes")
+
+                # Check before touching the index so it is never left dropped
+                duplicates = conn.execute(text(
+                    'SELECT COUNT(*) FROM (SELECT dedup_hash FROM companies '
+                    'WHERE dedup_hash IS NOT NULL '
+                    'GROUP BY dedup_hash HAVING COUNT(*) > 1) AS dup'
+                )).scalar()
+                if duplicates:
+                    raise RuntimeError(
+                        f"Cannot make idx_company_dedup unique: {duplicates} "
+                        f"dedup_hash values are shared by several companies"
+                    )
+
+                conn.execute(text('DROP INDEX idx_company_dedup'))
+                conn.execute(text(
+                    'CREATE UNIQUE INDEX idx_company_dedup ON companies (dedup_hash)'
+                ))
+            print("✅ Company dedup index made unique")
+
+
+def rehash_legacy_dedup(conn) -> int:
+    """
+    Rewrite legacy MD5 company dedup hashes to BLAKE2b
+
+    The dedup key is rebuilt from the stored phone/name/address (or
+    source/source_id) and a row is rewritten only if the MD5 of one of
+    those candidate keys matches its stored hash. Rows whose BLAKE2b hash
+    is already taken by another company keep their MD5 hash.
+
+    Args:
+        conn: Connection inside the migration transaction
+
+    Returns:
+        Number of rows rewritten
+    """
+    rows = conn.execute(text(
+        'SELECT id, dedup_hash, phone, name, address, source, source_id '
+        'FROM companies WHERE dedup_hash IS NOT NULL'
+    )).mappings().all()
+
+    taken = {row['dedup_hash'] for row in rows}
+    updates = []
+    for row in rows:
+        data = {field: row[field] or '' for field in ('phone', 'name', 'address', 'source', 'source_id')}
+        # The phone may have been filled in after the row was keyed by
+        # name+address, so every branch of dedup_key is tried
+        candidates = (
+            dedup_key(data),
+            dedup_key({**data, 'phone': ''}),
+            dedup_key({'source': data['source'], 'source_id': data['source_id']})
+        )
+        for key in candidates:
+            if hashlib.md5(key.encode()).hexdigest() == row['dedup_hash']:
+                new_hash = hash_dedup_key(key)
+                if new_hash not in taken:
+                    taken.add(new_hash)
+                    updates.append({'id': row['id'], 'dedup_hash': new_hash})
+                break
+
+    if updates:
+        conn.execute(
+            text('UPDATE companies SET dedup_hash = :dedup_hash WHERE id = :id'),
+            updates
+        )
+
+    return len(updates)
+
+
 def seed_categories():
     """
     Seed initial category data
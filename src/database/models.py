@@ -1,7 +1,10 @@
 """
 Database models for Lead Scraper System
 """
+import hashlib
 from datetime import datetime
+from typing import Dict
+
 from sqlalchemy import (
     Column, Integer, BigInteger, String, Float, DateTime, Boolean,
     Text, JSON, ForeignKey, Index, UniqueConstraint
@@ -12,6 +15,48 @@ from sqlalchemy.orm import relationship
 Base = declarative_base()
 
 
+def dedup_key(company_data: Dict) -> str:
+    """
+    Build deduplication key for company
+
+    Args:
+        company_data: Company data
+
+    Returns:
+        Key string (phone or name+address, falling back to source ID)
+    """
+    # Use phone or name+address for deduplication
+    key_parts = []
+
+    if company_data.get('phone'):
+        key_parts.append(company_data['phone'])
+    else:
+        if company_data.get('name'):
+            key_parts.append(company_data['name'].lower().strip())
+        if company_data.get('address'):
+            key_parts.append(company_data['address'].lower().strip())
+
+    if not key_parts:
+        # Fallback to source ID
+        key_parts.append(company_data.get('source', ''))
+        key_parts.append(company_data.get('source_id', ''))
+
+    return '|'.join(key_parts)
+
+
+def hash_dedup_key(key: str) -> str:
+    """
+    Hash deduplication key
+
+    Args:
+        key: Key from dedup_key()
+
+    Returns:
+        BLAKE2b-128 hex digest (32 chars, same width as the legacy MD5)
+    """
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
 class Category(Base):
     """Business categories/niches"""
     __tablename__ = 'categories'
@@ -76,7 +121,7 @@ class Company(Base):
     is_active = Column(Boolean, default=True)
 
     # Deduplication hash
-    dedup_hash = Column(String(64))  # MD5/SHA hash for deduplication
+    dedup_hash = Column(String(64))  # hash_dedup_key(dedup_key(...)), BLAKE2b-128
 
     # Relationships
     scrape_results = relationship("ScrapeResult", back_populates="company")
@@ -87,7 +132,7 @@ class Company(Base):
         Index('idx_company_category', 'category_id'),
         Index('idx_company_city', 'city'),
         Index('idx_company_source', 'source'),
-        Index('idx_company_dedup', 'dedup_hash'),
+        Index('idx_company_dedup', 'dedup_hash', unique=True),
     )
 
     def __repr__(self):
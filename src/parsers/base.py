@@ -2,12 +2,59 @@
 Base parser class for all scrapers
 """
 import logging
+import socket
 from abc import ABC, abstractmethod
 from typing import List, Dict, Optional
 from datetime import datetime
 
+import aiohttp
+
 logger = logging.getLogger(__name__)
 
+# Lowercase Belarus city names (Russian and Latin spellings)
+_BELARUS_CITIES = (
+    'минск', 'гомель', 'могилев', 'витебск', 'гродно', 'брест',
+    'бобруйск', 'барановичи', 'борисов', 'пинск', 'орша', 'мозырь',
+    'солигорск', 'новополоцк', 'лида', 'молодечно', 'полоцк', 'жлобин',
+    'minsk', 'gomel', 'mogilev', 'vitebsk', 'grodno', 'brest'
+)
+
+# Shared request timeout: separate connect and read budgets so a slow
+# connect fails fast instead of eating the whole 30 seconds
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=30, sock_connect=5, sock_read=25)
+
+# aiohttp decodes brotli only when brotlicffi (or Brotli) is installed,
+# so "br" is advertised only if responses can actually be decompressed
+try:
+    import brotlicffi  # noqa: F401
+    ACCEPT_ENCODING = 'br, gzip, deflate'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+
+def create_connector(**kwargs) -> aiohttp.TCPConnector:
+    """
+    Create TCP connector for a parser session
+
+    Parsers talk to a single host each, so DNS is resolved with the c-ares
+    based resolver (aiodns) and cached instead of going through
+    getaddrinfo on the default thread pool for every request.
+
+    Args:
+        **kwargs: Extra TCPConnector options (connection limits etc.)
+
+    Returns:
+        Configured connector
+    """
+    options = {
+        'resolver': aiohttp.AsyncResolver(),
+        'use_dns_cache': True,
+        'ttl_dns_cache': 600,
+        'family': socket.AF_INET
+    }
+    options.update(kwargs)
+    return aiohttp.TCPConnector(**options)
+
 
 class BaseParser(ABC):
     """Base class for all parsers"""
@@ -27,6 +74,18 @@ class BaseParser(ABC):
             'errors': []
         }
 
+    async def close(self):
+        """Release network resources (overridden by parsers that hold a session)"""
+        pass
+
+    async def __aenter__(self):
+        """Enter async context"""
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        """Exit async context and close the parser"""
+        await self.close()
+
     @abstractmethod
     async def search_by_category(
         self,
@@ -73,6 +132,10 @@ class BaseParser(ABC):
         if not phone:
             return None
 
+        # Already normalized (typical for API contact values)
+        if phone.startswith('+375') and phone[1:].isdigit():
+            return phone
+
         # Remove all non-digit characters
         digits = ''.join(filter(str.isdigit, phone))
 
@@ -128,18 +191,11 @@ class BaseParser(ABC):
         Returns:
             True if city is in Belarus
         """
-        belarus_cities = [
-            'минск', 'гомель', 'могилев', 'витебск', 'гродно', 'брест',
-            'бобруйск', 'барановичи', 'борисов', 'пинск', 'орша', 'мозырь',
-            'солигорск', 'новополоцк', 'лида', 'молодечно', 'полоцк', 'жлобин',
-            'minsk', 'gomel', 'mogilev', 'vitebsk', 'grodno', 'brest'
-        ]
-
         if not city:
             return False
 
         city_lower = city.lower()
-        return any(belarus_city in city_lower for belarus_city in belarus_cities)
+        return any(belarus_city in city_lower for belarus_city in _BELARUS_CITIES)
 
     def get_stats(self) -> Dict:
         """
@@ -174,4 +230,4 @@ class BaseParser(ABC):
             'company_id': company_id
         }
         self.stats['errors'].append(error_info)
-        logger.error(f"[{self.source_name}] {error}", extra={'company_id': company_id})
+        logger.error("[%s] %s", self.source_name, error, extra={'company_id': company_id})
@@ -4,8 +4,8 @@ EGR.gov.by parser - Belarus State Register
 import aiohttp
 import asyncio
 import logging
-from typing import List, Dict, Optional
-from .base import BaseParser
+from typing import AsyncIterator, List, Dict, Optional
+from .base import BaseParser, create_connector
 
 logger = logging.getLogger(__name__)
 
@@ -16,35 +16,41 @@ class EGRParser(BaseParser):
     # Category to ОКЭД (OKED) code mappings
     # These are economic activity codes used in Belarus
     CATEGORY_OKED = {
-        'auto_service': ['45.20', '45.3', '45.4'],  # Maintenance and repair of motor vehicles
-        'handyman': ['43.2', '43.3', '43.9'],  # Specialized construction activities
-        'cleaning': ['81.2', '81.29'],  # Cleaning activities
-        'moving': ['49.4', '52.29'],  # Freight transport
-        'education': ['85.5', '85.59'],  # Other education
-        'fitness': ['93.1', '93.13'],  # Fitness facilities
-        'photo_video': ['74.20', '59.11'],  # Photographic activities, motion picture
-        'legal': ['69.1', '69.10'],  # Legal activities
-        'psychology': ['86.90'],  # Other human health activities
-        'tattoo': ['96.02', '96.09']  # Hairdressing and other beauty treatment
+        'auto_service': ('45.20', '45.3', '45.4'),  # Maintenance and repair of motor vehicles
+        'handyman': ('43.2', '43.3', '43.9'),  # Specialized construction activities
+        'cleaning': ('81.2', '81.29'),  # Cleaning activities
+        'moving': ('49.4', '52.29'),  # Freight transport
+        'education': ('85.5', '85.59'),  # Other education
+        'fitness': ('93.1', '93.13'),  # Fitness facilities
+        'photo_video': ('74.20', '59.11'),  # Photographic activities, motion picture
+        'legal': ('69.1', '69.10'),  # Legal activities
+        'psychology': ('86.90',),  # Other human health activities
+        'tattoo': ('96.02', '96.09')  # Hairdressing and other beauty treatment
     }
 
     # Category keywords for text search (fallback)
     CATEGORY_KEYWORDS = {
-        'auto_service': ['автосервис', 'авторемонт', 'шиномонтаж'],
-        'handyman': ['мастер', 'ремонт', 'сантехник'],
-        'cleaning': ['клининг', 'уборка'],
-        'moving': ['грузоперевозк', 'перевозк'],
-        'education': ['репетитор', 'обучение', 'курсы'],
-        'fitness': ['фитнес', 'спорт'],
-        'photo_video': ['фото', 'видео'],
-        'legal': ['юридическ', 'адвокат'],
-        'psychology': ['психолог'],
-        'tattoo': ['тату', 'салон красоты']
+        'auto_service': ('автосервис', 'авторемонт', 'шиномонтаж'),
+        'handyman': ('мастер', 'ремонт', 'сантехник'),
+        'cleaning': ('клининг', 'уборка'),
+        'moving': ('грузоперевозк', 'перевозк'),
+        'education': ('репетитор', 'обучение', 'курсы'),
+        'fitness': ('фитнес', 'спорт'),
+        'photo_video': ('фото', 'видео'),
+        'legal': ('юридическ', 'адвокат'),
+        'psychology': ('психолог',),
+        'tattoo': ('тату', 'салон красоты')
     }
 
-    def __init__(self):
-        """Initialize EGR parser"""
+    def __init__(self, keep_raw: bool = False):
+        """
+        Initialize EGR parser
+
+        Args:
+            keep_raw: Attach the raw API item to each company as 'raw_data'
+        """
         super().__init__('egr')
+        self._keep_raw = keep_raw
         self.base_url = 'https://egr.gov.by/api/v2'
         self.session = None
 
@@ -55,7 +61,10 @@ class EGRParser(BaseParser):
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
                 'Accept': 'application/json'
             }
-            self.session = aiohttp.ClientSession(headers=headers)
+            self.session = aiohttp.ClientSession(
+                headers=headers,
+                connector=create_connector()
+            )
         return self.session
 
     async def close(self):
@@ -80,41 +89,75 @@ class EGRParser(BaseParser):
         Returns:
             List of company dictionaries
         """
-        results = []
+        return [company async for company in self.iter_by_category(category, city, limit)]
 
-        # Get OKED codes for category
-        oked_codes = self.CATEGORY_OKED.get(category, [])
+    async def iter_by_category(
+        self,
+        category: str,
+        city: Optional[str] = None,
+        limit: int = 100
+    ) -> AsyncIterator[Dict]:
+        """
+        Stream companies by category in EGR
 
-        # Search by OKED codes
-        for oked in oked_codes:
-            try:
-                companies = await self._search_by_oked(oked, city, limit // len(oked_codes))
-                results.extend(companies)
-                self.stats['total_found'] += len(companies)
+        Companies are yielded page by page, so callers can persist them
+        without holding the whole category in memory.
 
-                # Rate limiting
-                await asyncio.sleep(1.0)
+        Args:
+            category: Category name
+            city: City name (optional)
+            limit: Maximum number of results
+
+        Yields:
+            Company dictionaries
+        """
+        found = 0
 
-            except Exception as e:
-                self.log_error(f"Search error for OKED {oked}: {e}")
+        # Get OKED codes for category
+        oked_codes = self.CATEGORY_OKED.get(category, ())
+
+        # Search by OKED codes: one request per code (the API is not known to
+        # accept several codes at once), sent concurrently
+        if oked_codes:
+            per_code = max(1, limit // len(oked_codes))
+            outcomes = await asyncio.gather(
+                *(self._search_by_oked(oked, city, per_code) for oked in oked_codes),
+                return_exceptions=True
+            )
+
+            for oked, outcome in zip(oked_codes, outcomes):
+                if isinstance(outcome, Exception):
+                    self.log_error(f"Search error for OKED {oked}: {outcome}")
+                    continue
+
+                self.stats['total_found'] += len(outcome)
+                found += len(outcome)
+                for company in outcome:
+                    yield company
+
+            # Rate limiting
+            await asyncio.sleep(1.0)
 
         # Fallback: search by keywords if OKED search didn't return enough results
-        if len(results) < limit // 2:
-            keywords = self.CATEGORY_KEYWORDS.get(category, [])
+        if found < limit // 2:
+            keywords = self.CATEGORY_KEYWORDS.get(category, ())
+            per_keyword = max(1, limit // len(keywords)) if keywords else 0
             for keyword in keywords:
+                companies = []
                 try:
-                    companies = await self._search_by_keyword(keyword, city, limit // len(keywords))
-                    results.extend(companies)
+                    companies = await self._search_by_keyword(keyword, city, per_keyword)
                     self.stats['total_found'] += len(companies)
-
-                    # Rate limiting
-                    await asyncio.sleep(1.0)
-
                 except Exception as e:
                     self.log_error(f"Search error for keyword '{keyword}': {e}")
 
-        logger.info(f"[EGR] Found {len(results)} companies for category '{category}'")
-        return results
+                found += len(companies)
+                for company in companies:
+                    yield company
+
+                # Rate limiting
+                await asyncio.sleep(1.0)
+
+        logger.info("[EGR] Found %s companies for category '%s'", found, category)
 
     async def _search_by_oked(
         self,
@@ -154,24 +197,15 @@ class EGRParser(BaseParser):
 
                     # Parse results
                     items = data.get('data', {}).get('items', [])
-
-                    for item in items:
-                        try:
-                            company = self._parse_company(item)
-                            if company:
-                                companies.append(company)
-                                self.stats['successful'] += 1
-                        except Exception as e:
-                            self.log_error(f"Parse error: {e}")
-                            self.stats['failed'] += 1
+                    companies = self._parse_items(items)
 
                 else:
-                    logger.warning(f"[EGR] API returned status {response.status}")
+                    logger.warning("[EGR] API returned status %s", response.status)
 
         except asyncio.TimeoutError:
-            logger.warning(f"[EGR] Request timeout for OKED {oked}")
+            logger.warning("[EGR] Request timeout for OKED %s", oked)
         except Exception as e:
-            logger.error(f"[EGR] Request error: {e}")
+            logger.error("[EGR] Request error: %s", e)
 
         return companies
 
@@ -210,21 +244,28 @@ class EGRParser(BaseParser):
                 if response.status == 200:
                     data = await response.json()
                     items = data.get('data', {}).get('items', [])
-
-                    for item in items:
-                        try:
-                            company = self._parse_company(item)
-                            if company:
-                                companies.append(company)
-                                self.stats['successful'] += 1
-                        except Exception as e:
-                            self.log_error(f"Parse error: {e}")
-                            self.stats['failed'] += 1
+                    companies = self._parse_items(items)
 
         except asyncio.TimeoutError:
-            logger.warning(f"[EGR] Request timeout for keyword '{keyword}'")
+            logger.warning("[EGR] Request timeout for keyword '%s'", keyword)
         except Exception as e:
-            logger.error(f"[EGR] Request error: {e}")
+            logger.error("[EGR] Request error: %s", e)
+
+        return companies
+
+    def _parse_items(self, items: List[Dict]) -> List[Dict]:
+        """
+        Parse a page of EGR search results
+
+        Args:
+            items: Company items from API
+
+        Returns:
+            List of normalized companies
+        """
+        # _parse_company handles its own errors and returns None on failure
+        companies = [company for company in map(self._parse_company, items) if company]
+        self.stats['successful'] += len(companies)
 
         return companies
 
@@ -239,30 +280,32 @@ class EGRParser(BaseParser):
             Normalized company dictionary
         """
         try:
+            g = item.get
+
             # Get basic info
-            name = item.get('vnaim', '') or item.get('naimk', '')
+            name = g('vnaim') or g('naimk')
             if not name:
                 return None
 
             name = name.strip()
 
             # Get registration number (УНП)
-            unp = item.get('vnp', '') or item.get('ngrn', '')
+            unp = g('vnp') or g('ngrn') or ''
 
             # Get address
-            address = item.get('address', '') or item.get('vpadres', '')
+            address = g('address') or g('vpadres') or ''
 
             # Get region/city
-            region = item.get('voblast', '') or item.get('region', '')
+            region = g('voblast') or g('region') or ''
 
             # Get legal form
-            legal_form = item.get('vorgf', '')
+            legal_form = g('vorgf', '')
 
             # Get registration date
-            reg_date = item.get('dlikv', '') or item.get('dreg', '')
+            reg_date = g('dlikv') or g('dreg') or ''
 
             # Get OKED codes
-            oked = item.get('vidsDeятельности', [])
+            oked = g('vdeyatelnosti') or g('okeds') or []
             if isinstance(oked, str):
                 oked = [oked]
 
@@ -277,14 +320,16 @@ class EGRParser(BaseParser):
                 'oked_codes': oked,
                 'phone': None,  # EGR doesn't provide phones
                 'website': None,
-                'source': self.source_name,
-                'raw_data': item
+                'source': self.source_name
             }
 
+            if self._keep_raw:
+                company['raw_data'] = item
+
             return company
 
         except Exception as e:
-            logger.error(f"[EGR] Parse error: {e}")
+            logger.error("[EGR] Parse error: %s", e)
             return None
 
     async def get_company_details(self, company_id: str) -> Optional[Dict]:
@@ -308,6 +353,6 @@ class EGRParser(BaseParser):
                     return self._parse_company(company_data)
 
         except Exception as e:
-            logger.error(f"[EGR] Get details error: {e}")
+            logger.error("[EGR] Get details error: %s", e)
 
         return None
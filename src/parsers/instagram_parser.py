@@ -6,27 +6,51 @@ import asyncio
 import logging
 import json
 import re
-from typing import List, Dict, Optional
-from .base import BaseParser
+from functools import lru_cache
+from itertools import islice
+from typing import AsyncIterator, List, Dict, Optional
+from .base import BaseParser, create_connector
 
 logger = logging.getLogger(__name__)
 
+# Belarus phone patterns, in priority order
+_PHONE_PATTERNS = (
+    re.compile(r'\+375\s?\(?\d{2}\)?\s?\d{3}[-\s]?\d{2}[-\s]?\d{2}'),
+    re.compile(r'80\d{2}\s?\d{3}[-\s]?\d{2}[-\s]?\d{2}'),
+    re.compile(r'\d{2}[-\s]?\d{3}[-\s]?\d{2}[-\s]?\d{2}')
+)
+
+
+@lru_cache(maxsize=1024)
+def _find_phone(text: str) -> Optional[str]:
+    """
+    Find the first raw phone number in text
+
+    Cached because business accounts often repost identical captions.
+    """
+    for pattern in _PHONE_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            return match.group(0)
+
+    return None
+
 
 class InstagramParser(BaseParser):
     """Parser for Instagram business accounts"""
 
     # Category to hashtag mappings
     CATEGORY_HASHTAGS = {
-        'auto_service': ['автосервисминск', 'автосервисбеларусь', 'автомойкаминск', 'детейлингминск'],
-        'handyman': ['мастернадомминск', 'ремонтминск', 'мастернадомбеларусь'],
-        'cleaning': ['клинингминск', 'уборкаминск', 'клинингбеларусь'],
-        'moving': ['грузоперевозкиминск', 'переездминск', 'грузоперевозкибеларусь'],
-        'education': ['репетиторминск', 'курсыминск', 'репетиторбеларусь'],
-        'fitness': ['фитнесминск', 'спортминск', 'тренерминск'],
-        'photo_video': ['фотографминск', 'фотографбеларусь', 'видеографминск'],
-        'legal': ['юристминск', 'юристбеларусь', 'адвокатминск'],
-        'psychology': ['психологминск', 'психологбеларусь', 'психотерапевтминск'],
-        'tattoo': ['татуминск', 'татубеларусь', 'tattoominsk']
+        'auto_service': ('автосервисминск', 'автосервисбеларусь', 'автомойкаминск', 'детейлингминск'),
+        'handyman': ('мастернадомминск', 'ремонтминск', 'мастернадомбеларусь'),
+        'cleaning': ('клинингминск', 'уборкаминск', 'клинингбеларусь'),
+        'moving': ('грузоперевозкиминск', 'переездминск', 'грузоперевозкибеларусь'),
+        'education': ('репетиторминск', 'курсыминск', 'репетиторбеларусь'),
+        'fitness': ('фитнесминск', 'спортминск', 'тренерминск'),
+        'photo_video': ('фотографминск', 'фотографбеларусь', 'видеографминск'),
+        'legal': ('юристминск', 'юристбеларусь', 'адвокатминск'),
+        'psychology': ('психологминск', 'психологбеларусь', 'психотерапевтминск'),
+        'tattoo': ('татуминск', 'татубеларусь', 'tattoominsk')
     }
 
     # Belarus cities for location search
@@ -35,15 +59,17 @@ class InstagramParser(BaseParser):
         'Бобруйск', 'Барановичи', 'Борисов', 'Пинск'
     ]
 
-    def __init__(self, session_id: Optional[str] = None):
+    def __init__(self, session_id: Optional[str] = None, keep_raw: bool = False):
         """
         Initialize Instagram parser
 
         Args:
             session_id: Instagram session ID (optional, for authenticated requests)
+            keep_raw: Attach the full post caption to each account as 'raw_data'
         """
         super().__init__('instagram')
         self.session_id = session_id
+        self._keep_raw = keep_raw
         self.base_url = 'https://www.instagram.com'
         self.session = None
 
@@ -60,7 +86,10 @@ class InstagramParser(BaseParser):
             if self.session_id:
                 headers['Cookie'] = f'sessionid={self.session_id}'
 
-            self.session = aiohttp.ClientSession(headers=headers)
+            self.session = aiohttp.ClientSession(
+                headers=headers,
+                connector=create_connector()
+            )
         return self.session
 
     async def close(self):
@@ -85,30 +114,56 @@ class InstagramParser(BaseParser):
         Returns:
             List of business account dictionaries
         """
-        results = []
+        return [account async for account in self.iter_by_category(category, city, limit)]
+
+    async def iter_by_category(
+        self,
+        category: str,
+        city: Optional[str] = None,
+        limit: int = 100
+    ) -> AsyncIterator[Dict]:
+        """
+        Stream Instagram accounts by category
+
+        Accounts are yielded hashtag by hashtag, so callers can persist
+        them without holding the whole category in memory.
+
+        Args:
+            category: Category name
+            city: City name (optional)
+            limit: Maximum number of results
+
+        Yields:
+            Business account dictionaries
+        """
+        found = 0
+        city_lower = city.lower() if city else None
 
         # Get hashtags for category
-        hashtags = self.CATEGORY_HASHTAGS.get(category, [])
+        hashtags = self.CATEGORY_HASHTAGS.get(category, ())
+        per_hashtag = max(1, limit // len(hashtags)) if hashtags else 0
 
         # Search each hashtag
         for hashtag in hashtags:
+            accounts = []
             try:
-                accounts = await self._search_hashtag(hashtag, limit // len(hashtags))
-                results.extend(accounts)
+                accounts = await self._search_hashtag(hashtag, per_hashtag)
                 self.stats['total_found'] += len(accounts)
-
-                # Rate limiting (Instagram is strict!)
-                await asyncio.sleep(3.0)
-
             except Exception as e:
                 self.log_error(f"Search error for hashtag '#{hashtag}': {e}")
 
-        # Filter by city if specified
-        if city and results:
-            results = [r for r in results if self._matches_city(r, city)]
+            for account in accounts:
+                # Filter by city if specified
+                if city_lower and not self._matches_city(account, city_lower):
+                    continue
+
+                found += 1
+                yield account
 
-        logger.info(f"[Instagram] Found {len(results)} accounts for category '{category}'")
-        return results
+            # Rate limiting (Instagram is strict!)
+            await asyncio.sleep(3.0)
+
+        logger.info("[Instagram] Found %s accounts for category '%s'", found, category)
 
     async def _search_hashtag(
         self,
@@ -145,10 +200,11 @@ class InstagramParser(BaseParser):
                         # Parse posts from hashtag
                         posts = self._extract_posts_from_json(json_data)
 
-                        # Extract unique accounts from posts
+                        # Extract unique accounts from posts; scan past `limit`
+                        # posts so duplicate authors don't leave the page short
                         seen_usernames = set()
 
-                        for post in posts[:limit]:
+                        for post in islice(posts, limit * 2):
                             try:
                                 account = self._parse_post_account(post)
                                 if account and account['username'] not in seen_usernames:
@@ -167,12 +223,12 @@ class InstagramParser(BaseParser):
                     logger.warning("[Instagram] Rate limited")
                     await asyncio.sleep(10)
                 else:
-                    logger.warning(f"[Instagram] Page returned status {response.status}")
+                    logger.warning("[Instagram] Page returned status %s", response.status)
 
         except asyncio.TimeoutError:
-            logger.warning(f"[Instagram] Request timeout for #{hashtag}")
+            logger.warning("[Instagram] Request timeout for #%s", hashtag)
         except Exception as e:
-            logger.error(f"[Instagram] Request error: {e}")
+            logger.error("[Instagram] Request error: %s", e)
 
         return accounts
 
@@ -188,32 +244,23 @@ class InstagramParser(BaseParser):
                 return json.loads(json_str)
 
         except Exception as e:
-            logger.error(f"[Instagram] JSON extraction error: {e}")
+            logger.error("[Instagram] JSON extraction error: %s", e)
 
         return None
 
     def _extract_posts_from_json(self, data: Dict) -> List[Dict]:
         """Extract posts from Instagram JSON data"""
-        posts = []
-
         try:
             # Navigate through Instagram's data structure
-            entry_data = data.get('entry_data', {})
-            tag_page = entry_data.get('TagPage', [{}])[0]
-            graphql = tag_page.get('graphql', {})
-            hashtag = graphql.get('hashtag', {})
-            edge_hashtag_to_media = hashtag.get('edge_hashtag_to_media', {})
-            edges = edge_hashtag_to_media.get('edges', [])
-
-            for edge in edges:
-                node = edge.get('node', {})
-                if node:
-                    posts.append(node)
-
-        except Exception as e:
-            logger.error(f"[Instagram] Posts extraction error: {e}")
+            edges = (
+                data['entry_data']['TagPage'][0]['graphql']['hashtag']
+                ['edge_hashtag_to_media']['edges']
+            )
+            return [edge['node'] for edge in edges if edge.get('node')]
 
-        return posts
+        except (KeyError, IndexError, TypeError) as e:
+            logger.error("[Instagram] Posts extraction error: unexpected page structure (%r)", e)
+            return []
 
     def _parse_post_account(self, post: Dict) -> Optional[Dict]:
         """
@@ -252,18 +299,17 @@ class InstagramParser(BaseParser):
                 'instagram': profile_url,
                 'phone': phone,
                 'bio': caption[:200] if caption else None,  # First 200 chars
-                'source': self.source_name,
-                'raw_data': {
-                    'username': username,
-                    'profile_url': profile_url,
-                    'post_caption': caption
-                }
+                'source': self.source_name
             }
 
+            # Username and profile URL are already top-level fields
+            if self._keep_raw:
+                account['raw_data'] = {'post_caption': caption}
+
             return account
 
         except Exception as e:
-            logger.error(f"[Instagram] Parse account error: {e}")
+            logger.error("[Instagram] Parse account error: %s", e)
             return None
 
     def _extract_phone(self, text: str) -> Optional[str]:
@@ -271,36 +317,26 @@ class InstagramParser(BaseParser):
         if not text:
             return None
 
-        # Belarus phone patterns
-        patterns = [
-            r'\+375\s?\(?\d{2}\)?\s?\d{3}[-\s]?\d{2}[-\s]?\d{2}',
-            r'80\d{2}\s?\d{3}[-\s]?\d{2}[-\s]?\d{2}',
-            r'\d{2}[-\s]?\d{3}[-\s]?\d{2}[-\s]?\d{2}'
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text)
-            if match:
-                phone = match.group(0)
-                return self.normalize_phone(phone)
+        phone = _find_phone(text)
+        if phone:
+            return self.normalize_phone(phone)
 
         return None
 
-    def _matches_city(self, account: Dict, city: str) -> bool:
-        """Check if account is from specified city"""
-        city_lower = city.lower()
-
-        # Check in username
-        username = account.get('username', '').lower()
-        if city_lower in username:
-            return True
+    def _matches_city(self, account: Dict, city_lower: str) -> bool:
+        """
+        Check if account is from specified city
 
-        # Check in bio
-        bio = account.get('bio', '')
-        if bio and city_lower in bio.lower():
-            return True
+        Args:
+            account: Account dictionary
+            city_lower: Lowercased city name
 
-        return False
+        Returns:
+            True if city is mentioned in username or bio
+        """
+        # Username and bio are scanned as one lowercased string
+        haystack = f"{account.get('username', '')}\n{account.get('bio') or ''}".lower()
+        return city_lower in haystack
 
     async def get_company_details(self, company_id: str) -> Optional[Dict]:
         """
@@ -343,6 +379,6 @@ class InstagramParser(BaseParser):
                     }
 
         except Exception as e:
-            logger.error(f"[Instagram] Get details error: {e}")
+            logger.error("[Instagram] Get details error: %s", e)
 
         return None
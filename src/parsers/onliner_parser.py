@@ -4,13 +4,44 @@ Onliner.by parser - Services section
 import aiohttp
 import asyncio
 import logging
+from aiolimiter import AsyncLimiter
 from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve
 import re
-from .base import BaseParser
+from .base import BaseParser, ACCEPT_ENCODING, HTTP_TIMEOUT, create_connector
 
 logger = logging.getLogger(__name__)
 
+# Belarus phone patterns, in priority order
+_PHONE_PATTERNS = (
+    re.compile(r'\+375\s?\d{2}\s?\d{3}[-\s]?\d{2}[-\s]?\d{2}'),
+    re.compile(r'80\d{2}\s?\d{3}[-\s]?\d{2}[-\s]?\d{2}'),
+    re.compile(r'\d{3}[-\s]?\d{2}[-\s]?\d{2}')
+)
+
+# Only ad listing blocks are parsed from search pages
+_AD_CLASSES = frozenset({'classified__item', 'board__item'})
+
+# Matched per class token: a plain class_ list only matches elements whose
+# whole class attribute equals one of the names, dropping multi-class ads
+_AD_STRAINER = SoupStrainer(
+    class_=lambda value: bool(value) and not _AD_CLASSES.isdisjoint(value.split())
+)
+
+# Ad field selectors, compiled once instead of on every select_one call
+_TITLE_SEL = soupsieve.compile('.classified__title, .board__title')
+_LINK_SEL = soupsieve.compile('a[href]')
+_DESCRIPTION_SEL = soupsieve.compile('.classified__description, .board__description')
+_LOCATION_SEL = soupsieve.compile('.classified__location, .board__location')
+
+# Common Belarus cities, keyed by lowercase name
+_CITIES = {
+    city.lower(): city
+    for city in ('Минск', 'Гомель', 'Могилев', 'Витебск', 'Гродно', 'Брест')
+}
+_CITY_RE = re.compile('|'.join(_CITIES), re.IGNORECASE)
+
 
 class OnlinerParser(BaseParser):
     """Parser for Onliner.by services section"""
@@ -31,16 +62,16 @@ class OnlinerParser(BaseParser):
 
     # Search keywords for each category
     CATEGORY_KEYWORDS = {
-        'auto_service': ['автосервис', 'ремонт авто', 'шиномонтаж'],
-        'handyman': ['мастер', 'ремонт квартир'],
-        'cleaning': ['клининг', 'уборка'],
-        'moving': ['грузоперевозки', 'переезд'],
-        'education': ['репетитор', 'обучение'],
-        'fitness': ['фитнес', 'тренер'],
-        'photo_video': ['фотограф', 'видеосъемка'],
-        'legal': ['юрист', 'адвокат'],
-        'psychology': ['психолог'],
-        'tattoo': ['тату', 'мастер тату']
+        'auto_service': ('автосервис', 'ремонт авто', 'шиномонтаж'),
+        'handyman': ('мастер', 'ремонт квартир'),
+        'cleaning': ('клининг', 'уборка'),
+        'moving': ('грузоперевозки', 'переезд'),
+        'education': ('репетитор', 'обучение'),
+        'fitness': ('фитнес', 'тренер'),
+        'photo_video': ('фотограф', 'видеосъемка'),
+        'legal': ('юрист', 'адвокат'),
+        'psychology': ('психолог',),
+        'tattoo': ('тату', 'мастер тату')
     }
 
     def __init__(self):
@@ -48,6 +79,8 @@ class OnlinerParser(BaseParser):
         super().__init__('onliner')
         self.base_url = 'https://baraholka.onliner.by'
         self.session = None
+        self._sem = asyncio.Semaphore(5)  # Max concurrent page requests
+        self._limiter = AsyncLimiter(1, 2.0)  # 1 request per 2 seconds
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create aiohttp session"""
@@ -55,9 +88,20 @@ class OnlinerParser(BaseParser):
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
                 'Accept': 'text/html,application/xhtml+xml,application/xml',
-                'Accept-Language': 'ru-RU,ru;q=0.9'
+                'Accept-Language': 'ru-RU,ru;q=0.9',
+                'Accept-Encoding': ACCEPT_ENCODING
             }
-            self.session = aiohttp.ClientSession(headers=headers)
+            self.session = aiohttp.ClientSession(
+                headers=headers,
+                connector=create_connector(
+                    limit=100,
+                    limit_per_host=10,
+                    keepalive_timeout=30,
+                    ttl_dns_cache=300,
+                    enable_cleanup_closed=True
+                ),
+                timeout=HTTP_TIMEOUT
+            )
         return self.session
 
     async def close(self):
@@ -91,20 +135,24 @@ class OnlinerParser(BaseParser):
             return results
 
         # Get search keywords
-        keywords = self.CATEGORY_KEYWORDS.get(category, [])
+        keywords = self.CATEGORY_KEYWORDS.get(category, ())
+        if not keywords:
+            return results
 
-        # Search each keyword
-        for keyword in keywords:
-            try:
-                ads = await self._search_ads(category_url, keyword, city, limit // len(keywords))
-                results.extend(ads)
-                self.stats['total_found'] += len(ads)
+        # Search all keywords concurrently (bounded by self._sem and self._limiter)
+        per_keyword = limit // len(keywords)
+        outcomes = await asyncio.gather(
+            *(self._search_ads(category_url, keyword, city, per_keyword) for keyword in keywords),
+            return_exceptions=True
+        )
 
-                # Rate limiting
-                await asyncio.sleep(2.0)
+        for keyword, outcome in zip(keywords, outcomes):
+            if isinstance(outcome, Exception):
+                self.log_error(f"Search error for '{keyword}': {outcome}")
+                continue
 
-            except Exception as e:
-                self.log_error(f"Search error for '{keyword}': {e}")
+            results.extend(outcome)
+            self.stats['total_found'] += len(outcome)
 
         logger.info(f"[Onliner] Found {len(results)} ads for category '{category}'")
         return results
@@ -130,38 +178,46 @@ class OnlinerParser(BaseParser):
         """
         ads = []
         session = await self._get_session()
+        city_filter = city.lower() if city else None
 
         # Build search URL
         params = {
             'query': keyword
         }
 
-        try:
-            async with session.get(category_url, params=params, timeout=30) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-
-                    # Find ad listings
-                    ad_items = soup.select('.classified__item, .board__item')
-
-                    for item in ad_items[:limit]:
-                        try:
-                            ad = self._parse_ad(item, keyword, city)
-                            if ad:
-                                ads.append(ad)
-                                self.stats['successful'] += 1
-                        except Exception as e:
-                            self.log_error(f"Parse error: {e}")
-                            self.stats['failed'] += 1
-
-                else:
-                    logger.warning(f"[Onliner] Page returned status {response.status}")
-
-        except asyncio.TimeoutError:
-            logger.warning(f"[Onliner] Request timeout")
-        except Exception as e:
-            logger.error(f"[Onliner] Request error: {e}")
+        async with self._sem, self._limiter:
+            try:
+                async with session.get(category_url, params=params) as response:
+                    if response.status == 200:
+                        # Raw bytes go straight to lxml, no decoded str copy
+                        html = await response.read()
+                        soup = BeautifulSoup(
+                            html,
+                            'lxml',
+                            parse_only=_AD_STRAINER,
+                            from_encoding=response.charset
+                        )
+
+                        # Find ad listings (top-level strained elements)
+                        ad_items = soup.find_all(True, recursive=False)
+
+                        for item in ad_items[:limit]:
+                            try:
+                                ad = self._parse_ad(item, keyword, city_filter)
+                                if ad:
+                                    ads.append(ad)
+                                    self.stats['successful'] += 1
+                            except Exception as e:
+                                self.log_error(f"Parse error: {e}")
+                                self.stats['failed'] += 1
+
+                    else:
+                        logger.warning(f"[Onliner] Page returned status {response.status}")
+
+            except asyncio.TimeoutError:
+                logger.warning(f"[Onliner] Request timeout")
+            except Exception as e:
+                logger.error(f"[Onliner] Request error: {e}")
 
         return ads
 
@@ -172,31 +228,31 @@ class OnlinerParser(BaseParser):
         Args:
             item: BeautifulSoup ad element
             keyword: Search keyword
-            city_filter: City filter
+            city_filter: Lowercase city filter
 
         Returns:
             Normalized company/ad dictionary
         """
         try:
             # Get title
-            title_elem = item.select_one('.classified__title, .board__title')
+            title_elem = _TITLE_SEL.select_one(item)
             if not title_elem:
                 return None
 
             name = title_elem.get_text(strip=True)
 
             # Get link
-            link_elem = item.select_one('a[href]')
+            link_elem = _LINK_SEL.select_one(item)
             link = link_elem['href'] if link_elem else None
             if link and not link.startswith('http'):
                 link = f"https://baraholka.onliner.by{link}"
 
             # Get description
-            desc_elem = item.select_one('.classified__description, .board__description')
+            desc_elem = _DESCRIPTION_SEL.select_one(item)
             description = desc_elem.get_text(strip=True) if desc_elem else ''
 
             # Get location
-            location_elem = item.select_one('.classified__location, .board__location')
+            location_elem = _LOCATION_SEL.select_one(item)
             location = location_elem.get_text(strip=True) if location_elem else ''
 
             # Extract city from location
@@ -204,7 +260,7 @@ class OnlinerParser(BaseParser):
 
             # Filter by city if specified
             if city_filter and city:
-                if city_filter.lower() not in city.lower():
+                if city_filter not in city.lower():
                     return None
 
             # Try to extract phone from description
@@ -239,32 +295,24 @@ class OnlinerParser(BaseParser):
         if not location:
             return None
 
-        # Common Belarus cities
-        cities = ['Минск', 'Гомель', 'Могилев', 'Витебск', 'Гродно', 'Брест']
-
-        for city in cities:
-            if city.lower() in location.lower():
-                return city
+        match = _CITY_RE.search(location)
+        if match:
+            return _CITIES[match.group(0).lower()]
 
-        return location.split(',')[0] if ',' in location else location
+        return location.split(',', 1)[0]
 
     def _extract_phone(self, text: str) -> Optional[str]:
         """Extract phone number from text"""
         if not text:
             return None
 
-        # Belarus phone patterns
-        patterns = [
-            r'\+375\s?\d{2}\s?\d{3}[-\s]?\d{2}[-\s]?\d{2}',
-            r'80\d{2}\s?\d{3}[-\s]?\d{2}[-\s]?\d{2}',
-            r'\d{3}[-\s]?\d{2}[-\s]?\d{2}'
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text)
+        # Patterns are tried one by one: a single fused alternation would
+        # return non-overlapping leftmost matches, so a short local-number
+        # match could hide a +375 number starting inside it
+        for pattern in _PHONE_PATTERNS:
+            match = pattern.search(text)
             if match:
-                phone = match.group(0)
-                return self.normalize_phone(phone)
+                return self.normalize_phone(match.group(0))
 
         return None
 
@@ -284,10 +332,10 @@ class OnlinerParser(BaseParser):
         session = await self._get_session()
 
         try:
-            async with session.get(company_id, timeout=30) as response:
+            async with self._limiter, session.get(company_id) as response:
                 if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
+                    html = await response.read()
+                    soup = BeautifulSoup(html, 'lxml', from_encoding=response.charset)
 
                     # Extract additional details from ad page
                     # This can be enhanced based on actual page structure
@@ -3,16 +3,25 @@ Parser manager - coordinates all parsers and saves data to database
 """
 import asyncio
 import logging
+from contextlib import AsyncExitStack
 from typing import List, Dict, Optional
 from datetime import datetime
-import hashlib
 
-from ..database.models import Company, Category, ScrapeSession, ScrapeResult
+from sqlalchemy import func, literal_column, update
+from sqlalchemy.dialects.postgresql import insert
+
+from ..database.models import (
+    Company, Category, ScrapeSession, ScrapeResult, dedup_key, hash_dedup_key
+)
 from ..database.db import get_db_session
 from ..utils.config import config
 
 logger = logging.getLogger(__name__)
 
+# Companies from streaming parsers (iter_by_category) are saved in batches
+# of this size while the parser keeps fetching
+SAVE_BATCH_SIZE = 50
+
 
 class ParserManager:
     """Manages all parsers and database integration"""
@@ -21,6 +30,7 @@ class ParserManager:
         """Initialize parser manager"""
         self.parsers = []
         self.session_id = None
+        self._category_ids: Dict[str, int] = {}
 
     def register_parser(self, parser):
         """Register a parser"""
@@ -39,19 +49,35 @@ class ParserManager:
 
         logger.info(f"Starting scraping for {len(categories)} categories")
 
-        # Create scraping session
-        session_id = self._create_scrape_session('all_sources')
+        # Create scraping session. Database helpers are synchronous, so they
+        # run in worker threads to keep in-flight requests moving
+        session_id = await asyncio.to_thread(self._create_scrape_session, 'all_sources')
 
         try:
-            for parser in self.parsers:
-                await self._run_parser(parser, categories, session_id)
+            # Parsers are closed on exit even if scraping fails
+            async with AsyncExitStack() as stack:
+                for parser in self.parsers:
+                    await stack.enter_async_context(parser)
+
+                # Sources are independent hosts, so parsers run in parallel
+                outcomes = await asyncio.gather(
+                    *(self._run_parser(parser, categories, session_id) for parser in self.parsers),
+                    return_exceptions=True
+                )
+
+                for parser, outcome in zip(self.parsers, outcomes):
+                    if isinstance(outcome, Exception):
+                        logger.error(
+                            f"Parser {parser.source_name} failed: {outcome}",
+                            exc_info=outcome
+                        )
 
             # Mark session as completed
-            self._complete_scrape_session(session_id, 'completed')
+            await asyncio.to_thread(self._complete_scrape_session, session_id, 'completed')
 
         except Exception as e:
             logger.error(f"Scraping error: {e}", exc_info=True)
-            self._complete_scrape_session(session_id, 'failed', str(e))
+            await asyncio.to_thread(self._complete_scrape_session, session_id, 'failed', str(e))
 
     async def _run_parser(
         self,
@@ -73,16 +99,26 @@ class ParserManager:
             try:
                 logger.info(f"Scraping category: {category}")
 
-                # Search companies
-                companies = await parser.search_by_category(category, limit=100)
-
-                # Save to database
-                for company_data in companies:
-                    self._save_company(company_data, category, session_id)
+                category_id = await asyncio.to_thread(self._get_category_id, category)
+                if category_id is None:
+                    logger.warning(f"Category not found: {category}")
+                    continue
+
+                if hasattr(parser, 'iter_by_category'):
+                    # Streaming parsers: save batches as they arrive
+                    found = await self._stream_category(
+                        parser, category, category_id, session_id
+                    )
+                else:
+                    companies = await parser.search_by_category(category, limit=100)
+                    await asyncio.to_thread(
+                        self._save_companies, companies, category_id, session_id
+                    )
+                    found = len(companies)
 
                 logger.info(
                     f"[{parser.source_name}] Category '{category}': "
-                    f"found {len(companies)} companies"
+                    f"found {found} companies"
                 )
 
             except Exception as e:
@@ -91,6 +127,40 @@ class ParserManager:
                     f"with {parser.source_name}: {e}"
                 )
 
+    async def _stream_category(
+        self,
+        parser,
+        category: str,
+        category_id: int,
+        session_id: int
+    ) -> int:
+        """
+        Scrape one category from a streaming parser, saving in batches
+
+        Args:
+            parser: Parser instance providing iter_by_category
+            category: Category name
+            category_id: Category ID
+            session_id: Scrape session ID
+
+        Returns:
+            Number of companies found
+        """
+        found = 0
+        batch = []
+
+        async for company in parser.iter_by_category(category, limit=100):
+            batch.append(company)
+            found += 1
+            if len(batch) >= SAVE_BATCH_SIZE:
+                await asyncio.to_thread(self._save_companies, batch, category_id, session_id)
+                batch = []
+
+        if batch:
+            await asyncio.to_thread(self._save_companies, batch, category_id, session_id)
+
+        return found
+
     def _create_scrape_session(self, source: str) -> int:
         """
         Create a new scraping session
@@ -143,155 +213,193 @@ class ParserManager:
                 session.commit()
                 logger.info(f"Scrape session {session_id} marked as {status}")
 
-    def _save_company(
-        self,
-        company_data: Dict,
-        category_name: str,
-        session_id: int
-    ):
+    def _get_category_id(self, category_name: str) -> Optional[int]:
         """
-        Save company to database
+        Get category ID by name (cached for the manager's lifetime)
 
         Args:
-            company_data: Company data dictionary
             category_name: Category name
-            session_id: Scrape session ID
+
+        Returns:
+            Category ID or None if category doesn't exist
         """
-        with get_db_session() as session:
-            # Get category
-            category = session.query(Category).filter(
-                Category.name == category_name
-            ).first()
+        if category_name not in self._category_ids:
+            with get_db_session() as session:
+                category_id = session.query(Category.id).filter(
+                    Category.name == category_name
+                ).scalar()
 
-            if not category:
-                logger.warning(f"Category not found: {category_name}")
-                return
+            if category_id is None:
+                return None
 
-            # Check if company already exists
-            dedup_hash = self._generate_dedup_hash(company_data)
+            self._category_ids[category_name] = category_id
 
-            existing = session.query(Company).filter(
-                Company.dedup_hash == dedup_hash
-            ).first()
+        return self._category_ids[category_name]
 
-            action = 'skipped'
+    def _save_companies(
+        self,
+        companies: List[Dict],
+        category_id: int,
+        session_id: int
+    ):
+        """
+        Save a batch of companies to database
 
-            if existing:
-                # Update existing company
-                self._update_company(existing, company_data)
-                company_id = existing.id
-                action = 'updated'
+        Companies are upserted with a single INSERT ... ON CONFLICT on the
+        unique dedup_hash index, so concurrent parsers cannot insert the
+        same company twice. Scrape results and session statistics are
+        written in the same transaction.
 
-            else:
-                # Create new company
-                company = Company(
-                    name=company_data.get('name'),
-                    address=company_data.get('address'),
-                    phone=company_data.get('phone'),
-                    email=company_data.get('email'),
-                    website=company_data.get('website'),
-                    instagram=company_data.get('instagram'),
-                    facebook=company_data.get('facebook'),
-                    vk=company_data.get('vk'),
-                    telegram=company_data.get('telegram'),
-                    category_id=category.id,
-                    city=company_data.get('city'),
-                    district=company_data.get('district'),
-                    latitude=company_data.get('latitude'),
-                    longitude=company_data.get('longitude'),
-                    rating=company_data.get('rating'),
-                    reviews_count=company_data.get('reviews_count', 0),
-                    source=company_data.get('source'),
-                    source_id=company_data.get('source_id'),
-                    source_url=company_data.get('source_url'),
-                    raw_data=company_data.get('raw_data'),
-                    dedup_hash=dedup_hash,
-                    last_scraped_at=datetime.utcnow(),
-                    is_active=True
-                )
+        Args:
+            companies: List of company data dictionaries
+            category_id: Category ID
+            session_id: Scrape session ID
+        """
+        if not companies:
+            return
 
-                session.add(company)
-                session.flush()
-                company_id = company.id
-                action = 'created'
+        hashes = [hash_dedup_key(dedup_key(data)) for data in companies]
 
-            # Create scrape result record
-            scrape_result = ScrapeResult(
-                session_id=session_id,
-                company_id=company_id,
-                action=action
+        # One row per company: duplicates within the batch are merged first,
+        # since ON CONFLICT cannot touch the same row twice in one statement
+        rows = {}
+        for company_data, dedup_hash in zip(companies, hashes):
+            if dedup_hash in rows:
+                self._merge_company_data(rows[dedup_hash], company_data)
+            else:
+                rows[dedup_hash] = self._company_row(company_data, category_id, dedup_hash)
+
+        with get_db_session() as session:
+            # Existing companies only get empty contact fields filled in
+            # (same rules as _merge_company_data). Parsers save concurrently
+            # and their batches overlap, so rows go in dedup_hash order to
+            # make every transaction lock them in the same order (no deadlock)
+            now = datetime.utcnow()
+            stmt = insert(Company).values([rows[key] for key in sorted(rows)])
+            excluded = stmt.excluded
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Company.dedup_hash],
+                set_={
+                    'phone': func.coalesce(func.nullif(Company.phone, ''), excluded.phone),
+                    'email': func.coalesce(func.nullif(Company.email, ''), excluded.email),
+                    'website': func.coalesce(func.nullif(Company.website, ''), excluded.website),
+                    'instagram': func.coalesce(func.nullif(Company.instagram, ''), excluded.instagram),
+                    'rating': func.coalesce(func.nullif(excluded.rating, 0), Company.rating),
+                    'reviews_count': func.coalesce(
+                        func.nullif(excluded.reviews_count, 0), Company.reviews_count
+                    ),
+                    'last_scraped_at': now,
+                    'updated_at': now
+                }
+            ).returning(
+                Company.dedup_hash,
+                Company.id,
+                # xmax is 0 only for freshly inserted rows
+                literal_column('xmax = 0')
             )
-            session.add(scrape_result)
 
-            # Update session statistics
-            scrape_session = session.query(ScrapeSession).get(session_id)
-            if scrape_session:
-                scrape_session.total_scraped += 1
-                if action == 'created':
-                    scrape_session.new_companies += 1
-                elif action == 'updated':
-                    scrape_session.updated_companies += 1
+            saved = {
+                dedup_hash: (company_id, inserted)
+                for dedup_hash, company_id, inserted in session.execute(stmt)
+            }
+
+            # The first occurrence of a new company is 'created', anything
+            # else (existing rows, duplicates within the batch) is 'updated'
+            actions = []
+            seen = set()
+            for dedup_hash in hashes:
+                company_id, inserted = saved[dedup_hash]
+                created = inserted and dedup_hash not in seen
+                seen.add(dedup_hash)
+                actions.append((company_id, 'created' if created else 'updated'))
+
+            # Create scrape result records
+            session.bulk_insert_mappings(ScrapeResult, [
+                {
+                    'session_id': session_id,
+                    'company_id': company_id,
+                    'action': action
+                }
+                for company_id, action in actions
+            ])
+
+            # Update session statistics in place: parsers save concurrently,
+            # so counters are incremented in SQL rather than read and rewritten
+            created = sum(1 for _, action in actions if action == 'created')
+
+            session.execute(
+                update(ScrapeSession)
+                .where(ScrapeSession.id == session_id)
+                .values(
+                    total_scraped=ScrapeSession.total_scraped + len(actions),
+                    new_companies=ScrapeSession.new_companies + created,
+                    updated_companies=ScrapeSession.updated_companies + len(actions) - created
+                )
+            )
 
             session.commit()
 
-    def _generate_dedup_hash(self, company_data: Dict) -> str:
+    @staticmethod
+    def _company_row(company_data: Dict, category_id: int, dedup_hash: str) -> Dict:
         """
-        Generate deduplication hash for company
+        Build companies table row for a new company
 
         Args:
             company_data: Company data
+            category_id: Category ID
+            dedup_hash: Deduplication hash
 
         Returns:
-            MD5 hash
+            Column values for INSERT
         """
-        # Use phone or name+address for deduplication
-        key_parts = []
-
-        if company_data.get('phone'):
-            key_parts.append(company_data['phone'])
-        else:
-            if company_data.get('name'):
-                key_parts.append(company_data['name'].lower().strip())
-            if company_data.get('address'):
-                key_parts.append(company_data['address'].lower().strip())
-
-        if not key_parts:
-            # Fallback to source ID
-            key_parts.append(company_data.get('source', ''))
-            key_parts.append(company_data.get('source_id', ''))
-
-        key = '|'.join(key_parts)
-        return hashlib.md5(key.encode()).hexdigest()
-
-    def _update_company(self, company: Company, new_data: Dict):
+        now = datetime.utcnow()
+        return {
+            'name': company_data.get('name'),
+            'address': company_data.get('address'),
+            'phone': company_data.get('phone'),
+            'email': company_data.get('email'),
+            'website': company_data.get('website'),
+            'instagram': company_data.get('instagram'),
+            'facebook': company_data.get('facebook'),
+            'vk': company_data.get('vk'),
+            'telegram': company_data.get('telegram'),
+            'category_id': category_id,
+            'city': company_data.get('city'),
+            'district': company_data.get('district'),
+            'latitude': company_data.get('latitude'),
+            'longitude': company_data.get('longitude'),
+            'rating': company_data.get('rating'),
+            'reviews_count': company_data.get('reviews_count', 0),
+            'source': company_data.get('source'),
+            'source_id': company_data.get('source_id'),
+            'source_url': company_data.get('source_url'),
+            'raw_data': company_data.get('raw_data'),
+            'dedup_hash': dedup_hash,
+            'created_at': now,
+            'updated_at': now,
+            'last_scraped_at': now,
+            'is_active': True
+        }
+
+    @staticmethod
+    def _merge_company_data(row: Dict, new_data: Dict):
         """
-        Update existing company with new data
+        Merge duplicate company data into a pending companies row
 
         Args:
-            company: Existing company
+            row: Row built by _company_row
             new_data: New company data
         """
         # Update fields if new data is more complete
-        if new_data.get('phone') and not company.phone:
-            company.phone = new_data['phone']
-
-        if new_data.get('email') and not company.email:
-            company.email = new_data['email']
-
-        if new_data.get('website') and not company.website:
-            company.website = new_data['website']
-
-        if new_data.get('instagram') and not company.instagram:
-            company.instagram = new_data['instagram']
+        for field in ('phone', 'email', 'website', 'instagram'):
+            if new_data.get(field) and not row[field]:
+                row[field] = new_data[field]
 
         if new_data.get('rating'):
-            company.rating = new_data['rating']
+            row['rating'] = new_data['rating']
 
         if new_data.get('reviews_count'):
-            company.reviews_count = new_data['reviews_count']
-
-        company.last_scraped_at = datetime.utcnow()
-        company.updated_at = datetime.utcnow()
+            row['reviews_count'] = new_data['reviews_count']
 
 
 # Global parser manager instance
@@ -4,11 +4,17 @@
 import aiohttp
 import asyncio
 import logging
+import orjson
+from aiolimiter import AsyncLimiter
 from typing import List, Dict, Optional
-from .base import BaseParser
+from .base import BaseParser, ACCEPT_ENCODING, HTTP_TIMEOUT, create_connector
 
 logger = logging.getLogger(__name__)
 
+# Raw item fields kept as 'raw_data'; everything else is already
+# extracted into company columns
+_RAW_DATA_FIELDS = ('id', 'link', 'rubrics', 'schedule')
+
 
 class TwoGISParser(BaseParser):
     """Parser for 2GIS API"""
@@ -25,16 +31,16 @@ class TwoGISParser(BaseParser):
 
     # Category mappings to 2GIS rubrics
     CATEGORY_RUBRICS = {
-        'auto_service': ['автосервис', 'шиномонтаж', 'автомойка', 'детейлинг'],
-        'handyman': ['мастер на час', 'сантехник', 'электрик', 'ремонт'],
-        'cleaning': ['клининг', 'уборка', 'химчистка'],
-        'moving': ['грузоперевозки', 'переезд', 'грузчики'],
-        'education': ['репетитор', 'курсы', 'обучение', 'учебный центр'],
-        'fitness': ['фитнес', 'спортзал', 'йога', 'танцы'],
-        'photo_video': ['фотограф', 'фотостудия', 'видеосъемка'],
-        'legal': ['юридические услуги', 'нотариус', 'адвокат'],
-        'psychology': ['психолог', 'психотерапевт', 'коуч'],
-        'tattoo': ['тату', 'татуировка', 'пирсинг', 'перманентный макияж']
+        'auto_service': ('автосервис', 'шиномонтаж', 'автомойка', 'детейлинг'),
+        'handyman': ('мастер на час', 'сантехник', 'электрик', 'ремонт'),
+        'cleaning': ('клининг', 'уборка', 'химчистка'),
+        'moving': ('грузоперевозки', 'переезд', 'грузчики'),
+        'education': ('репетитор', 'курсы', 'обучение', 'учебный центр'),
+        'fitness': ('фитнес', 'спортзал', 'йога', 'танцы'),
+        'photo_video': ('фотограф', 'фотостудия', 'видеосъемка'),
+        'legal': ('юридические услуги', 'нотариус', 'адвокат'),
+        'psychology': ('психолог', 'психотерапевт', 'коуч'),
+        'tattoo': ('тату', 'татуировка', 'пирсинг', 'перманентный макияж')
     }
 
     def __init__(self, api_key: Optional[str] = None):
@@ -48,11 +54,23 @@ class TwoGISParser(BaseParser):
         self.api_key = api_key or 'demo'  # Demo key for testing
         self.base_url = 'https://catalog.api.2gis.com/3.0'
         self.session = None
+        self._sem = asyncio.Semaphore(5)  # Max concurrent API requests
+        self._limiter = AsyncLimiter(2, 1.0)  # 2 requests per second
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create aiohttp session"""
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            self.session = aiohttp.ClientSession(
+                headers={'Accept-Encoding': ACCEPT_ENCODING},
+                connector=create_connector(
+                    limit=100,
+                    limit_per_host=10,
+                    keepalive_timeout=30,
+                    ttl_dns_cache=300,
+                    enable_cleanup_closed=True
+                ),
+                timeout=HTTP_TIMEOUT
+            )
         return self.session
 
     async def close(self):
@@ -80,38 +98,40 @@ class TwoGISParser(BaseParser):
         results = []
 
         # Get search queries for category
-        queries = self.CATEGORY_RUBRICS.get(category, [category])
+        queries = self.CATEGORY_RUBRICS.get(category, (category,))
 
         # Get region IDs to search
-        regions = []
+        regions = ()
         if city:
-            city_lower = city.lower()
-            region_id = self.BELARUS_REGIONS.get(city_lower)
+            region_id = self.BELARUS_REGIONS.get(city.lower())
             if region_id:
-                regions = [region_id]
+                regions = (region_id,)
         else:
             # Search all Belarus regions
-            regions = list(self.BELARUS_REGIONS.values())
-
-        # Search each query in each region
-        for query in queries:
-            for region_id in regions:
-                try:
-                    companies = await self._search_items(query, region_id, limit)
-                    results.extend(companies)
-                    self.stats['total_found'] += len(companies)
-
-                    logger.info(
-                        f"[2GIS] Found {len(companies)} companies "
-                        f"for '{query}' in region {region_id}"
-                    )
-
-                    # Rate limiting
-                    await asyncio.sleep(0.5)
-
-                except Exception as e:
-                    self.log_error(f"Search error for '{query}': {e}")
-                    self.stats['failed'] += 1
+            regions = tuple(self.BELARUS_REGIONS.values())
+
+        # Search all query/region pairs concurrently (bounded by self._sem and
+        # self._limiter). Queries are not joined into one q: 2GIS treats free
+        # text as a single phrase, not an OR over the terms
+        pairs = [(query, region_id) for query in queries for region_id in regions]
+        outcomes = await asyncio.gather(
+            *(self._search_items(query, region_id, limit) for query, region_id in pairs),
+            return_exceptions=True
+        )
+
+        for (query, region_id), outcome in zip(pairs, outcomes):
+            if isinstance(outcome, Exception):
+                self.log_error(f"Search error for '{query}': {outcome}")
+                self.stats['failed'] += 1
+                continue
+
+            results.extend(outcome)
+            self.stats['total_found'] += len(outcome)
+
+            logger.info(
+                f"[2GIS] Found {len(outcome)} companies "
+                f"for '{query}' in region {region_id}"
+            )
 
         return results
 
@@ -145,27 +165,28 @@ class TwoGISParser(BaseParser):
 
         companies = []
 
-        try:
-            async with session.get(url, params=params, timeout=30) as response:
-                if response.status == 200:
-                    data = await response.json()
-
-                    if 'result' in data and 'items' in data['result']:
-                        for item in data['result']['items']:
-                            company = self._parse_item(item)
-                            if company:
-                                companies.append(company)
-                                self.stats['successful'] += 1
-                else:
-                    logger.error(f"[2GIS] API error: {response.status}")
-                    self.stats['failed'] += 1
-
-        except asyncio.TimeoutError:
-            logger.error(f"[2GIS] Timeout for query: {query}")
-            self.stats['failed'] += 1
-        except Exception as e:
-            logger.error(f"[2GIS] Error: {e}")
-            self.stats['failed'] += 1
+        async with self._sem, self._limiter:
+            try:
+                async with session.get(url, params=params) as response:
+                    if response.status == 200:
+                        data = orjson.loads(await response.read())
+
+                        if 'result' in data and 'items' in data['result']:
+                            for item in data['result']['items']:
+                                company = self._parse_item(item)
+                                if company:
+                                    companies.append(company)
+                                    self.stats['successful'] += 1
+                    else:
+                        logger.error(f"[2GIS] API error: {response.status}")
+                        self.stats['failed'] += 1
+
+            except asyncio.TimeoutError:
+                logger.error(f"[2GIS] Timeout for query: {query}")
+                self.stats['failed'] += 1
+            except Exception as e:
+                logger.error(f"[2GIS] Error: {e}")
+                self.stats['failed'] += 1
 
         return companies
 
@@ -180,25 +201,34 @@ class TwoGISParser(BaseParser):
             Normalized company dict or None
         """
         try:
+            # Check city first: non-Belarus items are dropped before
+            # anything else is extracted
+            address_data = item.get('address') or {}
+            components = address_data.get('components', ())
+
+            city = next(
+                (comp.get('name') for comp in components if comp.get('type') == 'city'),
+                None
+            )
+            if not city or not self.is_belarus_city(city):
+                return None
+
             # Extract basic info
             company = {
                 'name': item.get('name'),
                 'source': '2gis',
                 'source_id': item.get('id'),
                 'source_url': item.get('link'),
-                'raw_data': item
+                'raw_data': {key: item.get(key) for key in _RAW_DATA_FIELDS},
+                'city': city
             }
 
             # Address
-            if 'address' in item:
-                address_data = item['address']
+            if address_data:
                 company['address'] = address_data.get('name')
-                if 'components' in address_data:
-                    for comp in address_data['components']:
-                        if comp.get('type') == 'city':
-                            company['city'] = comp.get('name')
-                        elif comp.get('type') == 'district':
-                            company['district'] = comp.get('name')
+                for comp in components:
+                    if comp.get('type') == 'district':
+                        company['district'] = comp.get('name')
 
             # Coordinates
             if 'point' in item:
@@ -227,11 +257,7 @@ class TwoGISParser(BaseParser):
                 company['rating'] = reviews.get('rating')
                 company['reviews_count'] = reviews.get('total')
 
-            # Check if city is in Belarus
-            if company.get('city') and self.is_belarus_city(company['city']):
-                return company
-
-            return None
+            return company
 
         except Exception as e:
             self.log_error(f"Parse error: {e}", item.get('id'))
@@ -257,9 +283,9 @@ class TwoGISParser(BaseParser):
         }
 
         try:
-            async with session.get(url, params=params, timeout=30) as response:
+            async with self._limiter, session.get(url, params=params) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = orjson.loads(await response.read())
 
                     if 'result' in data and 'items' in data['result']:
                         items = data['result']['items']
@@ -4,8 +4,12 @@ Yandex Maps API parser for Belarus
 import aiohttp
 import asyncio
 import logging
+import orjson
+import random
 from typing import List, Dict, Optional
-from .base import BaseParser
+from aiolimiter import AsyncLimiter
+from .base import BaseParser, ACCEPT_ENCODING, HTTP_TIMEOUT, create_connector
+from ..utils.config import config
 
 logger = logging.getLogger(__name__)
 
@@ -26,19 +30,23 @@ class YandexMapsParser(BaseParser):
         'борисов': (54.2274, 28.5051),
         'пинск': (52.1229, 26.0951),
     }
+    _CITY_ITEMS = tuple(BELARUS_CITIES.items())
+
+    # Attempts per search request before giving up
+    MAX_ATTEMPTS = 5
 
     # Category mappings to Yandex search terms
     CATEGORY_KEYWORDS = {
-        'auto_service': ['автосервис', 'шиномонтаж', 'автомойка', 'детейлинг авто'],
-        'handyman': ['мастер на час', 'мастер на дом', 'мелкий ремонт'],
-        'cleaning': ['клининг', 'клининговые услуги', 'уборка квартир'],
-        'moving': ['грузоперевозки', 'переезд квартирный', 'грузчики'],
-        'education': ['репетитор', 'репетиторские услуги', 'курсы обучения'],
-        'fitness': ['фитнес клуб', 'тренажерный зал', 'йога студия'],
-        'photo_video': ['фотограф', 'фотостудия', 'видеосъемка'],
-        'legal': ['юридические услуги', 'юридическая консультация', 'адвокат'],
-        'psychology': ['психолог', 'психологическая помощь', 'психотерапевт'],
-        'tattoo': ['тату салон', 'татуировка', 'тату студия']
+        'auto_service': ('автосервис', 'шиномонтаж', 'автомойка', 'детейлинг авто'),
+        'handyman': ('мастер на час', 'мастер на дом', 'мелкий ремонт'),
+        'cleaning': ('клининг', 'клининговые услуги', 'уборка квартир'),
+        'moving': ('грузоперевозки', 'переезд квартирный', 'грузчики'),
+        'education': ('репетитор', 'репетиторские услуги', 'курсы обучения'),
+        'fitness': ('фитнес клуб', 'тренажерный зал', 'йога студия'),
+        'photo_video': ('фотограф', 'фотостудия', 'видеосъемка'),
+        'legal': ('юридические услуги', 'юридическая консультация', 'адвокат'),
+        'psychology': ('психолог', 'психологическая помощь', 'психотерапевт'),
+        'tattoo': ('тату салон', 'татуировка', 'тату студия')
     }
 
     def __init__(self, api_key: Optional[str] = None):
@@ -52,11 +60,23 @@ class YandexMapsParser(BaseParser):
         self.api_key = api_key or 'demo'  # Demo key for testing
         self.base_url = 'https://search-maps.yandex.ru/v1/'
         self.session = None
+        self._sem = asyncio.Semaphore(config.MAX_CONCURRENT_SCRAPERS)  # Max concurrent API requests
+        self._limiter = AsyncLimiter(config.YANDEX_MAPS_RATE_LIMIT, 1.0)  # Requests per second
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create aiohttp session"""
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            self.session = aiohttp.ClientSession(
+                headers={'Accept-Encoding': ACCEPT_ENCODING},
+                connector=create_connector(
+                    limit=64,
+                    limit_per_host=16,
+                    keepalive_timeout=75,
+                    ttl_dns_cache=300,
+                    enable_cleanup_closed=True
+                ),
+                timeout=HTTP_TIMEOUT
+            )
         return self.session
 
     async def close(self):
@@ -84,39 +104,51 @@ class YandexMapsParser(BaseParser):
         results = []
 
         # Get search keywords for category
-        keywords = self.CATEGORY_KEYWORDS.get(category, [category])
+        keywords = self.CATEGORY_KEYWORDS.get(category, (category,))
 
         # Get cities to search
-        cities = {}
+        cities = ()
         if city:
             city_lower = city.lower()
             coords = self.BELARUS_CITIES.get(city_lower)
             if coords:
-                cities[city_lower] = coords
+                cities = ((city_lower, coords),)
         else:
             # Search all Belarus cities
-            cities = self.BELARUS_CITIES
-
-        # Search each keyword in each city
-        for keyword in keywords:
-            for city_name, coords in cities.items():
-                try:
-                    companies = await self._search_organizations(
-                        keyword,
-                        coords,
-                        city_name,
-                        limit
-                    )
-                    results.extend(companies)
-                    self.stats['total_found'] += len(companies)
-
-                    # Rate limiting
-                    await asyncio.sleep(0.5)
-
-                except Exception as e:
-                    self.log_error(f"Search error for '{keyword}' in {city_name}: {e}")
-
-        logger.info(f"[Yandex Maps] Found {len(results)} companies for category '{category}'")
+            cities = self._CITY_ITEMS
+
+        # Search all keyword/city pairs concurrently (bounded by self._sem and self._limiter)
+        pairs = [
+            (keyword, city_name, coords)
+            for keyword in keywords
+            for city_name, coords in cities
+        ]
+        outcomes = await asyncio.gather(
+            *(
+                self._search_organizations(keyword, coords, city_name, limit)
+                for keyword, city_name, coords in pairs
+            ),
+            return_exceptions=True
+        )
+
+        # The same company is often found by several keywords; only the
+        # first occurrence of each (name, city, phone) is kept
+        seen = set()
+
+        for (keyword, city_name, _), outcome in zip(pairs, outcomes):
+            if isinstance(outcome, Exception):
+                self.log_error(f"Search error for '{keyword}' in {city_name}: {outcome}")
+                continue
+
+            self.stats['total_found'] += len(outcome)
+
+            for company in outcome:
+                key = (company['name'].casefold(), company['city'], company['phone'])
+                if key not in seen:
+                    seen.add(key)
+                    results.append(company)
+
+        logger.info("[Yandex Maps] Found %s companies for category '%s'", len(results), category)
         return results
 
     async def _search_organizations(
@@ -139,7 +171,6 @@ class YandexMapsParser(BaseParser):
             List of company dictionaries
         """
         companies = []
-        session = await self._get_session()
 
         # Yandex Maps Search API parameters
         params = {
@@ -152,34 +183,77 @@ class YandexMapsParser(BaseParser):
             'results': min(limit, 50)  # Max 50 per request
         }
 
-        try:
-            async with session.get(self.base_url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-
-                    # Parse response
-                    features = data.get('features', [])
-
-                    for feature in features:
-                        try:
-                            company = self._parse_company(feature, city_name, query)
-                            if company:
-                                companies.append(company)
-                                self.stats['successful'] += 1
-                        except Exception as e:
-                            self.log_error(f"Parse error: {e}")
-                            self.stats['failed'] += 1
-
-                elif response.status == 403:
-                    logger.warning("[Yandex Maps] API key invalid or quota exceeded")
-                else:
-                    logger.warning(f"[Yandex Maps] API returned status {response.status}")
+        features = await self._fetch_features(params)
 
-        except Exception as e:
-            logger.error(f"[Yandex Maps] Request error: {e}")
+        for feature in features:
+            try:
+                company = self._parse_company(feature, city_name, query)
+                if company:
+                    companies.append(company)
+                    self.stats['successful'] += 1
+            except Exception as e:
+                self.log_error(f"Parse error: {e}")
+                self.stats['failed'] += 1
 
         return companies
 
+    async def _fetch_features(self, params: Dict) -> List[Dict]:
+        """
+        Fetch search result features, retrying transient failures
+
+        Throttled responses (429/503) are retried after Retry-After when the
+        API sends it, otherwise after exponential backoff with jitter;
+        connection errors and timeouts use the same backoff.
+
+        Args:
+            params: Search API query parameters
+
+        Returns:
+            List of GeoJSON features (empty on failure)
+        """
+        session = await self._get_session()
+
+        for attempt in range(self.MAX_ATTEMPTS):
+            delay = 2 ** attempt + random.uniform(0, 0.5)
+
+            # The slot is released while backing off
+            async with self._sem, self._limiter:
+                try:
+                    async with session.get(self.base_url, params=params) as response:
+                        if response.status == 200:
+                            data = orjson.loads(await response.read())
+                            return data.get('features', [])
+
+                        if response.status in (429, 503):
+                            retry_after = response.headers.get('Retry-After')
+                            if retry_after and retry_after.isdigit():
+                                delay = int(retry_after) + random.uniform(0, 0.5)
+                            logger.warning(
+                                "[Yandex Maps] Throttled (%s), attempt %s/%s",
+                                response.status, attempt + 1, self.MAX_ATTEMPTS
+                            )
+                        elif response.status == 403:
+                            logger.warning("[Yandex Maps] API key invalid or quota exceeded")
+                            return []
+                        else:
+                            logger.warning("[Yandex Maps] API returned status %s", response.status)
+                            return []
+
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    logger.warning(
+                        "[Yandex Maps] Request error: %s, attempt %s/%s",
+                        e, attempt + 1, self.MAX_ATTEMPTS
+                    )
+                except Exception as e:
+                    logger.error("[Yandex Maps] Request error: %s", e)
+                    return []
+
+            if attempt + 1 < self.MAX_ATTEMPTS:
+                await asyncio.sleep(delay)
+
+        self.log_error(f"Giving up on '{params['text']}' after {self.MAX_ATTEMPTS} attempts")
+        return []
+
     def _parse_company(self, feature: Dict, city: str, category_query: str) -> Optional[Dict]:
         """
         Parse company from Yandex Maps feature
@@ -205,25 +279,23 @@ class YandexMapsParser(BaseParser):
             address = company_meta.get('address', '')
 
             # Get coordinates
-            geometry = feature.get('geometry', {})
-            coordinates = geometry.get('coordinates', [])
+            coordinates = feature.get('geometry', {}).get('coordinates', ())
 
             # Get contact info
-            phones = []
-            phone_data = company_meta.get('Phones', [])
-            for phone_item in phone_data:
-                formatted = phone_item.get('formatted')
-                if formatted:
-                    normalized = self.normalize_phone(formatted)
-                    if normalized:
-                        phones.append(normalized)
+            normalize_phone = self.normalize_phone
+            phones = [
+                phone for phone in (
+                    normalize_phone(phone_item.get('formatted'))
+                    for phone_item in company_meta.get('Phones', ())
+                )
+                if phone
+            ]
 
             # Get website
             website = company_meta.get('url')
 
             # Get categories
-            categories = company_meta.get('Categories', [])
-            category_names = [cat.get('name', '') for cat in categories]
+            category_names = [cat.get('name', '') for cat in company_meta.get('Categories', ())]
 
             # Build company dict
             company = {
@@ -236,7 +308,7 @@ class YandexMapsParser(BaseParser):
                 'category': category_query,
                 'categories': category_names,
                 'latitude': coordinates[1] if len(coordinates) > 1 else None,
-                'longitude': coordinates[0] if len(coordinates) > 0 else None,
+                'longitude': coordinates[0] if coordinates else None,
                 'source': self.source_name,
                 'raw_data': properties
             }
@@ -248,7 +320,7 @@ class YandexMapsParser(BaseParser):
             return company
 
         except Exception as e:
-            logger.error(f"[Yandex Maps] Parse error: {e}")
+            logger.error("[Yandex Maps] Parse error: %s", e)
             return None
 
     async def get_company_details(self, company_id: str) -> Optional[Dict]:
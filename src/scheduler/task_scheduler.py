@@ -2,19 +2,35 @@
 Task scheduler for automated scraping
 """
 import asyncio
+import importlib
 import logging
-from datetime import datetime
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+from aiolimiter import AsyncLimiter
+from telegram.error import RetryAfter
 
-from ..parsers.parser_manager import parser_manager
-from ..parsers.twogis_parser import TwoGISParser
 from ..bot.exporter import csv_exporter
 from ..bot.auth import auth_manager
 from ..utils.config import config
 
 logger = logging.getLogger(__name__)
 
+# Parsers run by the daily job:
+# (label, module, class name, required config key, constructor kwarg)
+# Parsers with a config key are skipped when it is not set.
+_PARSERS = (
+    ('2GIS', 'twogis_parser', 'TwoGISParser', 'TWOGIS_API_KEY', 'api_key'),
+    ('Yandex Maps', 'yandex_parser', 'YandexMapsParser', 'YANDEX_API_KEY', 'api_key'),
+    ('EGR.gov.by', 'egr_parser', 'EGRParser', None, None),
+    ('Onliner.by', 'onliner_parser', 'OnlinerParser', None, None),
+    ('Deal.by', 'deal_parser', 'DealParser', None, None),
+    ('Instagram', 'instagram_parser', 'InstagramParser', 'INSTAGRAM_SESSION_ID', 'session_id'),
+)
+
+# Placeholder values copied from .env.example are treated as unset
+_PLACEHOLDER_VALUES = ('your_2gis_api_key_here',)
+
 
 class TaskScheduler:
     """Manages scheduled tasks"""
@@ -26,26 +42,46 @@ class TaskScheduler:
         Args:
             bot_app: Telegram bot application (for sending messages)
         """
-        self.scheduler = AsyncIOScheduler()
         self.bot_app = bot_app
         self.is_running = False
+        self._run_at = None  # (hour, minute) in UTC
+        self._next_run: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
 
     def setup_jobs(self):
         """Setup all scheduled jobs"""
-        # Parse schedule time from config (e.g., "03:00")
+        # Schedule time from config (e.g., "03:00")
         schedule_time = config.SCRAPING_TIME
-        hour, minute = map(int, schedule_time.split(':'))
+        hour, minute = config.get_scraping_time()
+
+        # Daily scraping job (the only job, run by _daily_loop)
+        self._run_at = (hour, minute)
+
+        logger.info("✅ Scheduled daily scraping at %s UTC", schedule_time)
+
+    def _next_run_after(self, now: datetime) -> datetime:
+        """
+        Get next daily run time
 
-        # Daily scraping job
-        self.scheduler.add_job(
-            self.run_daily_scraping,
-            trigger=CronTrigger(hour=hour, minute=minute),
-            id='daily_scraping',
-            name='Daily Lead Scraping',
-            replace_existing=True
-        )
+        Args:
+            now: Current UTC time
 
-        logger.info(f"✅ Scheduled daily scraping at {schedule_time} UTC")
+        Returns:
+            Next run time (today if still ahead, otherwise tomorrow)
+        """
+        hour, minute = self._run_at
+        target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if target <= now:
+            target += timedelta(days=1)
+        return target
+
+    async def _daily_loop(self):
+        """Sleep until the scheduled time, run scraping, repeat"""
+        while self.is_running:
+            now = datetime.now(timezone.utc)
+            self._next_run = self._next_run_after(now)
+            await asyncio.sleep((self._next_run - now).total_seconds())
+            await self.run_daily_scraping()
 
     async def run_daily_scraping(self):
         """
@@ -56,54 +92,12 @@ class TaskScheduler:
         logger.info("="*60)
 
         try:
-            # Register all parsers
-            logger.info("📦 Registering parsers...")
-
-            # 2GIS Parser
-            if config.TWOGIS_API_KEY and config.TWOGIS_API_KEY != 'your_2gis_api_key_here':
-                logger.info("  ✅ 2GIS parser")
-                twogis = TwoGISParser(api_key=config.TWOGIS_API_KEY)
-                parser_manager.register_parser(twogis)
-            else:
-                logger.info("  ⚠️  2GIS parser skipped (no API key)")
-
-            # Yandex Maps Parser
-            if hasattr(config, 'YANDEX_API_KEY') and config.YANDEX_API_KEY:
-                from ..parsers.yandex_parser import YandexMapsParser
-                logger.info("  ✅ Yandex Maps parser")
-                yandex = YandexMapsParser(api_key=config.YANDEX_API_KEY)
-                parser_manager.register_parser(yandex)
-            else:
-                logger.info("  ⚠️  Yandex Maps parser skipped (no API key)")
-
-            # EGR Parser (no API key needed)
-            from ..parsers.egr_parser import EGRParser
-            logger.info("  ✅ EGR.gov.by parser")
-            egr = EGRParser()
-            parser_manager.register_parser(egr)
-
-            # Onliner Parser (no API key needed)
-            from ..parsers.onliner_parser import OnlinerParser
-            logger.info("  ✅ Onliner.by parser")
-            onliner = OnlinerParser()
-            parser_manager.register_parser(onliner)
-
-            # Deal Parser (no API key needed)
-            from ..parsers.deal_parser import DealParser
-            logger.info("  ✅ Deal.by parser")
-            deal = DealParser()
-            parser_manager.register_parser(deal)
-
-            # Instagram Parser (optional)
-            if hasattr(config, 'INSTAGRAM_SESSION_ID') and config.INSTAGRAM_SESSION_ID:
-                from ..parsers.instagram_parser import InstagramParser
-                logger.info("  ✅ Instagram parser")
-                instagram = InstagramParser(session_id=config.INSTAGRAM_SESSION_ID)
-                parser_manager.register_parser(instagram)
-            else:
-                logger.info("  ⚠️  Instagram parser skipped (no session ID)")
-
-            # Run scraping
+            from ..parsers.parser_manager import parser_manager
+
+            self._register_parsers(parser_manager)
+
+            # Run scraping (registered parsers run concurrently, a failing
+            # parser is logged without stopping the others)
             logger.info("🔍 Starting scraping...")
             categories = config.get_enabled_niches()
             await parser_manager.run_all_parsers(categories)
@@ -114,7 +108,36 @@ class TaskScheduler:
             await self.send_results_to_users()
 
         except Exception as e:
-            logger.error(f"❌ Scheduled scraping failed: {e}", exc_info=True)
+            logger.error("❌ Scheduled scraping failed: %s", e, exc_info=True)
+
+    def _register_parsers(self, parser_manager):
+        """
+        Register the parsers for a scraping run (replacing any from a previous run)
+
+        Parser modules are imported here, on first scheduled run, so the
+        bot process does not load them at startup.
+
+        Args:
+            parser_manager: Parser manager to register with
+        """
+        logger.info("📦 Registering parsers...")
+        parser_manager.parsers.clear()
+
+        for label, module, class_name, config_key, kwarg in _PARSERS:
+            kwargs = {}
+            if config_key:
+                value = getattr(config, config_key)
+                if not value or value in _PLACEHOLDER_VALUES:
+                    logger.info("  ⚠️  %s parser skipped (no %s)", label, config_key)
+                    continue
+                kwargs[kwarg] = value
+
+            parser_class = getattr(
+                importlib.import_module(f'..parsers.{module}', __package__),
+                class_name
+            )
+            parser_manager.register_parser(parser_class(**kwargs))
+            logger.info("  ✅ %s parser", label)
 
     async def send_results_to_users(self):
         """
@@ -141,10 +164,14 @@ class TaskScheduler:
                 logger.info("No authorized users to send to")
                 return
 
+            # Read the file once: the same bytes are sent to every user
+            # and their length gives the size without another stat call
+            path = Path(file_path)
+            payload = await asyncio.to_thread(path.read_bytes)
+            filename = path.name
+
             # Prepare message
-            import os
-            file_size = os.path.getsize(file_path)
-            file_size_str = csv_exporter.format_file_size(file_size)
+            file_size_str = csv_exporter.format_file_size(len(payload))
 
             message = (
                 f"🔄 Автоматическое обновление базы лидов\n\n"
@@ -157,42 +184,66 @@ class TaskScheduler:
 
             message += f"\nРазмер: {file_size_str}"
 
-            # Send to all users
-            sent_count = 0
-            for user in users:
-                try:
-                    with open(file_path, 'rb') as f:
-                        await self.bot_app.bot.send_document(
-                            chat_id=user.telegram_id,
-                            document=f,
-                            filename=os.path.basename(file_path),
-                            caption=message
-                        )
-                    sent_count += 1
-                    logger.info(f"Sent CSV to user {user.telegram_id}")
-
-                    # Small delay between sends
-                    await asyncio.sleep(0.5)
-
-                except Exception as e:
-                    logger.error(f"Failed to send to user {user.telegram_id}: {e}")
-
-            logger.info(f"✅ Sent CSV to {sent_count}/{len(users)} users")
+            # Sends run concurrently, paced under Telegram's bulk limit
+            limiter = AsyncLimiter(20, 1.0)
+
+            async def send(user) -> bool:
+                # One retry when Telegram asks to back off (flood control)
+                for attempt in range(2):
+                    async with limiter:
+                        try:
+                            await self.bot_app.bot.send_document(
+                                chat_id=user.telegram_id,
+                                document=payload,
+                                filename=filename,
+                                caption=message
+                            )
+                            logger.info("Sent CSV to user %s", user.telegram_id)
+                            return True
+
+                        except RetryAfter as e:
+                            if attempt:
+                                logger.error("Failed to send to user %s: %s", user.telegram_id, e)
+                                return False
+                            retry_after = e.retry_after
+
+                        except Exception as e:
+                            logger.error("Failed to send to user %s: %s", user.telegram_id, e)
+                            return False
+
+                    logger.warning(
+                        "Flood limit sending to user %s, retrying in %ss",
+                        user.telegram_id, retry_after
+                    )
+                    await asyncio.sleep(retry_after)
+
+                return False
+
+            sent = await asyncio.gather(*(send(user) for user in users))
+            sent_count = sum(sent)
+
+            logger.info("✅ Sent CSV to %s/%s users", sent_count, len(users))
 
         except Exception as e:
-            logger.error(f"Failed to send results: {e}", exc_info=True)
+            logger.error("Failed to send results: %s", e, exc_info=True)
 
     def start(self):
         """Start scheduler"""
         if not self.is_running:
-            self.scheduler.start()
+            if self._run_at is None:
+                self.setup_jobs()
+
             self.is_running = True
+            self._next_run = self._next_run_after(datetime.now(timezone.utc))
+            self._task = asyncio.create_task(self._daily_loop())
             logger.info("✅ Scheduler started")
 
     def stop(self):
         """Stop scheduler"""
         if self.is_running:
-            self.scheduler.shutdown()
+            self._task.cancel()
+            self._task = None
+            self._next_run = None
             self.is_running = False
             logger.info("⏹️  Scheduler stopped")
 
@@ -206,13 +257,10 @@ class TaskScheduler:
         Returns:
             Next run time or None
         """
-        if not self.is_running:
+        if not self.is_running or job_id != 'daily_scraping':
             return None
 
-        job = self.scheduler.get_job(job_id)
-        if job and hasattr(job, 'next_run_time'):
-            return job.next_run_time
-        return None
+        return self._next_run
 
     async def trigger_manual_scraping(self):
         """Manually trigger scraping (for testing)"""
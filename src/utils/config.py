@@ -2,7 +2,8 @@
 Configuration loader and validator
 """
 import os
-from typing import List, Optional
+from functools import lru_cache
+from typing import Optional, Tuple
 from dotenv import load_dotenv
 
 # Load .env file
@@ -28,6 +29,8 @@ class Config:
     # Scraping
     SCRAPING_SCHEDULE: str = os.getenv('SCRAPING_SCHEDULE', 'daily')
     SCRAPING_TIME: str = os.getenv('SCRAPING_TIME', '03:00')
+    # Max concurrent HTTP requests per parser (applied by the Yandex Maps parser;
+    # request pacing is YANDEX_MAPS_RATE_LIMIT below)
     MAX_CONCURRENT_SCRAPERS: int = int(os.getenv('MAX_CONCURRENT_SCRAPERS', 3))
 
     # Geographic
@@ -40,7 +43,13 @@ class Config:
     PROXY_USERNAME: Optional[str] = os.getenv('PROXY_USERNAME')
     PROXY_PASSWORD: Optional[str] = os.getenv('PROXY_PASSWORD')
 
-    # Rate Limiting
+    # Parser API keys (parsers without a key are skipped by the scheduler)
+    YANDEX_API_KEY: Optional[str] = os.getenv('YANDEX_API_KEY')
+    TWOGIS_API_KEY: Optional[str] = os.getenv('TWOGIS_API_KEY')
+    INSTAGRAM_SESSION_ID: Optional[str] = os.getenv('INSTAGRAM_SESSION_ID')
+
+    # Rate Limiting (requests per second; YANDEX_MAPS_RATE_LIMIT drives the Yandex
+    # parser's limiter, it no longer sizes the Yandex concurrency semaphore)
     YANDEX_MAPS_RATE_LIMIT: int = int(os.getenv('YANDEX_MAPS_RATE_LIMIT', 10))
     TWOGIS_RATE_LIMIT: int = int(os.getenv('TWOGIS_RATE_LIMIT', 15))
     INSTAGRAM_RATE_LIMIT: int = int(os.getenv('INSTAGRAM_RATE_LIMIT', 5))
@@ -70,6 +79,13 @@ class Config:
         if not cls.DATABASE_URL:
             errors.append("DATABASE_URL is required")
 
+        try:
+            hour, minute = cls.get_scraping_time()
+            if not (0 <= hour < 24 and 0 <= minute < 60):
+                raise ValueError(cls.SCRAPING_TIME)
+        except ValueError:
+            errors.append(f"SCRAPING_TIME must be HH:MM, got '{cls.SCRAPING_TIME}'")
+
         if errors:
             print("❌ Configuration errors:")
             for error in errors:
@@ -79,10 +95,11 @@ class Config:
         return True
 
     @classmethod
-    def get_enabled_niches(cls) -> List[str]:
-        """Get list of enabled niches"""
+    @lru_cache(maxsize=1)
+    def get_enabled_niches(cls) -> Tuple[str, ...]:
+        """Get enabled niches (computed once, settings are read at import)"""
         if cls.ENABLED_NICHES == 'all':
-            return [
+            return (
                 'auto_service',
                 'handyman',
                 'cleaning',
@@ -93,8 +110,15 @@ class Config:
                 'legal',
                 'psychology',
                 'tattoo'
-            ]
-        return [n.strip() for n in cls.ENABLED_NICHES.split(',')]
+            )
+        return tuple(n.strip() for n in cls.ENABLED_NICHES.split(','))
+
+    @classmethod
+    @lru_cache(maxsize=1)
+    def get_scraping_time(cls) -> Tuple[int, int]:
+        """Get scheduled scraping time as (hour, minute)"""
+        hour, minute = map(int, cls.SCRAPING_TIME.split(':'))
+        return hour, minute
 
     @classmethod
     def print_config(cls):
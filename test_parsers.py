@@ -6,7 +6,9 @@ import sys
 import os
 import logging
 
-sys.path.insert(0, os.path.dirname(__file__))
+_HERE = os.path.dirname(os.path.abspath(__file__))
+if _HERE not in sys.path:
+    sys.path.insert(0, _HERE)
 
 from src.parsers.yandex_parser import YandexMapsParser
 from src.parsers.egr_parser import EGRParser
@@ -14,6 +16,7 @@ from src.parsers.onliner_parser import OnlinerParser
 from src.parsers.deal_parser import DealParser
 from src.parsers.instagram_parser import InstagramParser
 from src.parsers.twogis_parser import TwoGISParser
+from src.utils.config import config
 
 # Setup logging
 logging.basicConfig(
@@ -23,49 +26,54 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Caps how many parsers search at once, same limit as the scheduled runs
+SEM = asyncio.BoundedSemaphore(config.MAX_CONCURRENT_SCRAPERS)
+
 
 async def test_parser(parser, parser_name: str, category: str):
     """Test a single parser"""
-    logger.info(f"\n{'='*60}")
-    logger.info(f"Testing {parser_name}")
-    logger.info(f"{'='*60}")
+    logger.info("\n%s", '=' * 60)
+    logger.info("Testing %s", parser_name)
+    logger.info("%s", '=' * 60)
 
     try:
         # Search
-        results = await parser.search_by_category(
-            category=category,
-            city='минск',
-            limit=5
-        )
+        async with SEM:
+            results = await parser.search_by_category(
+                category=category,
+                city='минск',
+                limit=5
+            )
 
-        logger.info(f"✅ {parser_name}: Found {len(results)} results")
+        logger.info("✅ %s: Found %d results", parser_name, len(results))
 
         # Show first result
-        if results:
+        if results and logger.isEnabledFor(logging.INFO):
             first = results[0]
-            logger.info(f"\nSample result:")
-            logger.info(f"  Name: {first.get('name', 'N/A')}")
-            logger.info(f"  City: {first.get('city', 'N/A')}")
-            logger.info(f"  Phone: {first.get('phone', 'N/A')}")
-            logger.info(f"  Address: {first.get('address', 'N/A')[:50] if first.get('address') else 'N/A'}")
+            logger.info("\nSample result:")
+            logger.info("  Name: %s", first.get('name', 'N/A'))
+            logger.info("  City: %s", first.get('city', 'N/A'))
+            logger.info("  Phone: %s", first.get('phone', 'N/A'))
+            logger.info("  Address: %s", (first.get('address') or 'N/A')[:50])
 
         # Get stats
         stats = parser.get_stats()
-        logger.info(f"\nStats:")
-        logger.info(f"  Total found: {stats['total_found']}")
-        logger.info(f"  Successful: {stats['successful']}")
-        logger.info(f"  Failed: {stats['failed']}")
-        logger.info(f"  Success rate: {stats['success_rate']:.1f}%")
-
-        # Close parser
-        await parser.close()
+        logger.info("\nStats:")
+        logger.info("  Total found: %s", stats['total_found'])
+        logger.info("  Successful: %s", stats['successful'])
+        logger.info("  Failed: %s", stats['failed'])
+        logger.info("  Success rate: %.1f%%", stats['success_rate'])
 
         return True
 
     except Exception as e:
-        logger.error(f"❌ {parser_name} failed: {e}", exc_info=True)
+        logger.error("❌ %s failed: %s", parser_name, e, exc_info=True)
         return False
 
+    finally:
+        # Close the parser's session even when the search failed
+        await parser.close()
+
 
 async def main():
     """Run all parser tests"""
@@ -74,36 +82,21 @@ async def main():
     logger.info("="*60)
 
     test_category = 'auto_service'
-    results = {}
-
-    # Test 2GIS Parser
-    parser = TwoGISParser(api_key='demo')
-    results['2GIS'] = await test_parser(parser, '2GIS', test_category)
-    await asyncio.sleep(2)
-
-    # Test Yandex Maps Parser
-    parser = YandexMapsParser(api_key='demo')
-    results['Yandex Maps'] = await test_parser(parser, 'Yandex Maps', test_category)
-    await asyncio.sleep(2)
-
-    # Test EGR Parser
-    parser = EGRParser()
-    results['EGR'] = await test_parser(parser, 'EGR.gov.by', test_category)
-    await asyncio.sleep(2)
-
-    # Test Onliner Parser
-    parser = OnlinerParser()
-    results['Onliner'] = await test_parser(parser, 'Onliner.by', test_category)
-    await asyncio.sleep(2)
-
-    # Test Deal Parser
-    parser = DealParser()
-    results['Deal'] = await test_parser(parser, 'Deal.by', test_category)
-    await asyncio.sleep(2)
-
-    # Test Instagram Parser
-    parser = InstagramParser()
-    results['Instagram'] = await test_parser(parser, 'Instagram', test_category)
+
+    # Parsers are I/O-bound and each owns its HTTP session, so run them concurrently
+    parsers = {
+        '2GIS': TwoGISParser(api_key='demo'),
+        'Yandex Maps': YandexMapsParser(api_key='demo'),
+        'EGR.gov.by': EGRParser(),
+        'Onliner.by': OnlinerParser(),
+        'Deal.by': DealParser(),
+        'Instagram': InstagramParser(),
+    }
+    outcomes = await asyncio.gather(
+        *(test_parser(parser, name, test_category) for name, parser in parsers.items()),
+        return_exceptions=True
+    )
+    results = {name: outcome is True for name, outcome in zip(parsers, outcomes)}
 
     # Summary
     logger.info(f"\n{'='*60}")
@@ -3,81 +3,97 @@ Quick test - verify all parsers can be imported and initialized
 """
 import sys
 import os
+import importlib
+from concurrent.futures import ThreadPoolExecutor
 
-sys.path.insert(0, os.path.dirname(__file__))
+_HERE = os.path.dirname(os.path.abspath(__file__))
+if _HERE not in sys.path:
+    sys.path.insert(0, _HERE)
 
 print("="*60)
 print("PARSER IMPORT TEST")
 print("="*60)
 
+# (label, module, class, constructor kwargs, expected source_name)
+PARSERS = [
+    ('2GIS Parser', 'src.parsers.twogis_parser', 'TwoGISParser', {'api_key': 'demo'}, '2gis'),
+    ('Yandex Maps Parser', 'src.parsers.yandex_parser', 'YandexMapsParser', {'api_key': 'demo'}, 'yandex_maps'),
+    ('EGR Parser', 'src.parsers.egr_parser', 'EGRParser', {}, 'egr'),
+    ('Onliner Parser', 'src.parsers.onliner_parser', 'OnlinerParser', {}, 'onliner'),
+    ('Deal Parser', 'src.parsers.deal_parser', 'DealParser', {}, 'deal'),
+    ('Instagram Parser', 'src.parsers.instagram_parser', 'InstagramParser', {}, 'instagram'),
+]
+
+
+def _probe(label, module_name, class_name, kwargs, source_name):
+    """Import and instantiate one parser, returning (label, error or None)"""
+    try:
+        parser_class = getattr(importlib.import_module(module_name), class_name)
+        parser = parser_class(**kwargs)
+        assert parser.source_name == source_name
+        return label, None
+    except Exception as e:
+        return label, e
+
+
 tests_passed = []
 tests_failed = []
 
-# Test 2GIS Parser
+# Every parser pulls in aiohttp through src.parsers.base; import it once up front
+# so the worker threads don't all queue on the same module import lock
 try:
-    from src.parsers.twogis_parser import TwoGISParser
-    parser = TwoGISParser(api_key='demo')
-    assert parser.source_name == '2gis'
-    tests_passed.append('2GIS Parser')
-    print("✅ 2GIS Parser - OK")
-except Exception as e:
-    tests_failed.append(f'2GIS Parser: {e}')
-    print(f"❌ 2GIS Parser - FAILED: {e}")
+    importlib.import_module('src.parsers.base')
+except Exception:
+    pass  # each probe reports the import error for its own parser
 
-# Test Yandex Maps Parser
-try:
-    from src.parsers.yandex_parser import YandexMapsParser
-    parser = YandexMapsParser(api_key='demo')
-    assert parser.source_name == 'yandex_maps'
-    tests_passed.append('Yandex Maps Parser')
-    print("✅ Yandex Maps Parser - OK")
-except Exception as e:
-    tests_failed.append(f'Yandex Maps Parser: {e}')
-    print(f"❌ Yandex Maps Parser - FAILED: {e}")
+# Imports are dominated by first-touch I/O of each module's dependencies, so run them in parallel
+with ThreadPoolExecutor(max_workers=len(PARSERS)) as executor:
+    outcomes = list(executor.map(lambda p: _probe(*p), PARSERS))
+
+for label, error in outcomes:
+    if error is None:
+        tests_passed.append(label)
+        print(f"✅ {label} - OK")
+    else:
+        tests_failed.append(f'{label}: {error}')
+        print(f"❌ {label} - FAILED: {error}")
 
-# Test EGR Parser
+# Onliner ad strainer - listing items usually carry modifier classes too
+ONLINER_FIXTURE = b"""
+<div class="board">
+  <div class="board__item">plain</div>
+  <div class="board__item board__item_premium">premium</div>
+  <div class="classified__item classified__item_highlighted">highlighted</div>
+  <div class="board__banner">banner</div>
+</div>
+"""
 try:
-    from src.parsers.egr_parser import EGRParser
-    parser = EGRParser()
-    assert parser.source_name == 'egr'
-    tests_passed.append('EGR Parser')
-    print("✅ EGR Parser - OK")
+    from bs4 import BeautifulSoup
+    from src.parsers.onliner_parser import _AD_STRAINER
+    soup = BeautifulSoup(ONLINER_FIXTURE, 'lxml', parse_only=_AD_STRAINER)
+    items = [tag.get_text() for tag in soup.find_all(True, recursive=False)]
+    assert items == ['plain', 'premium', 'highlighted'], items
+    tests_passed.append('Onliner ad strainer')
+    print("✅ Onliner ad strainer - OK")
 except Exception as e:
-    tests_failed.append(f'EGR Parser: {e}')
-    print(f"❌ EGR Parser - FAILED: {e}")
+    tests_failed.append(f'Onliner ad strainer: {e!r}')
+    print(f"❌ Onliner ad strainer - FAILED: {e!r}")
 
-# Test Onliner Parser
+# Onliner phone extraction - pattern priority, including overlapping matches
 try:
     from src.parsers.onliner_parser import OnlinerParser
     parser = OnlinerParser()
-    assert parser.source_name == 'onliner'
-    tests_passed.append('Onliner Parser')
-    print("✅ Onliner Parser - OK")
-except Exception as e:
-    tests_failed.append(f'Onliner Parser: {e}')
-    print(f"❌ Onliner Parser - FAILED: {e}")
-
-# Test Deal Parser
-try:
-    from src.parsers.deal_parser import DealParser
-    parser = DealParser()
-    assert parser.source_name == 'deal'
-    tests_passed.append('Deal Parser')
-    print("✅ Deal Parser - OK")
-except Exception as e:
-    tests_failed.append(f'Deal Parser: {e}')
-    print(f"❌ Deal Parser - FAILED: {e}")
-
-# Test Instagram Parser
-try:
-    from src.parsers.instagram_parser import InstagramParser
-    parser = InstagramParser()
-    assert parser.source_name == 'instagram'
-    tests_passed.append('Instagram Parser')
-    print("✅ Instagram Parser - OK")
+    for text, expected in (
+        ('тел 123-45-67 или +375 29 123 45 67', '+375291234567'),
+        ('код 12380291234567', '+375291234567'),
+        ('звоните 80291234567', '+375291234567'),
+    ):
+        assert parser._extract_phone(text) == expected, (text, parser._extract_phone(text))
+    tests_passed.append('Onliner phone extraction')
+    print("✅ Onliner phone extraction - OK")
 except Exception as e:
-    tests_failed.append(f'Instagram Parser: {e}')
-    print(f"❌ Instagram Parser - FAILED: {e}")
+    tests_failed.append(f'Onliner phone extraction: {e!r}')
+    print(f"❌ Onliner phone extraction - FAILED: {e!r}")
 
 # Summary
 print("\n" + "="*60)